@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import time
 from contextlib import AbstractContextManager
-from typing import Optional, Callable
+from typing import Dict, List, Optional, Callable
 
 from loguru import logger
-from playwright.sync_api import sync_playwright, Page, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import sync_playwright, BrowserContext, Page, Route, TimeoutError as PlaywrightTimeoutError
 
 
 class BaseScraper(AbstractContextManager):
@@ -17,6 +17,15 @@ class BaseScraper(AbstractContextManager):
             html = scraper.get_html()
     """
 
+    # Requests aborted when `block_resources` is set: nothing the scrapers read comes from them.
+    # Stylesheets are kept so element visibility checks (e.g. "Load More") stay accurate.
+    BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+    BLOCKED_URL_PARTS = ("google-analytics", "googletagmanager", "doubleclick", "facebook", "hotjar")
+    # Chromium flags for headless scraping: nothing is displayed, so skip GPU and extension setup
+    LAUNCH_ARGS = ("--disable-gpu", "--disable-extensions")
+    # With `block_resources`, also stop Blink from loading images (e.g. inline data: URIs, which bypass routing)
+    NO_IMAGES_ARG = "--blink-settings=imagesEnabled=false"
+
     def __init__(
         self,
         headless: bool = True,
@@ -24,20 +33,39 @@ class BaseScraper(AbstractContextManager):
         max_retries: int = 3,
         wait_between_retries: float = 2.0,
         disable_js: bool = False,
+        prefetch_depth: int = 1,
+        block_resources: bool = False,
+        lazy_browser: bool = False,
     ) -> None:
         self.headless = headless
         self.timeout_ms = timeout_ms
         self.max_retries = max_retries
         self.wait_between_retries = wait_between_retries
         self.disable_js = disable_js
+        self.prefetch_depth = prefetch_depth
+        self.block_resources = block_resources
+        self.lazy_browser = lazy_browser
 
         self._playwright = None
         self.browser = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
 
+        # Secondary pages used to start upcoming navigations while the current page is processed:
+        # url -> page still loading it (oldest first), plus idle pages ready for reuse
+        self._prefetched: Dict[str, Page] = {}
+        self._spare_pages: List[Page] = []
+
     # --- context manager lifecycle -------------------------------------------------
 
     def __enter__(self) -> "BaseScraper":
+        # With `lazy_browser`, Chromium is only started by the first load_page
+        if not self.lazy_browser:
+            self._start_browser()
+        return self
+
+    def _start_browser(self) -> None:
+        """Start Playwright, the browser, its context and the main page."""
         logger.debug("Starting Playwright...")
         self._playwright = sync_playwright().start()
         
@@ -47,23 +75,33 @@ class BaseScraper(AbstractContextManager):
             context_options['java_script_enabled'] = False
             logger.info("JavaScript disabled for faster scraping")
         
-        self.browser = self._playwright.chromium.launch(headless=self.headless)
+        launch_args = list(self.LAUNCH_ARGS)
+        if self.block_resources:
+            launch_args.append(self.NO_IMAGES_ARG)
+        self.browser = self._playwright.chromium.launch(headless=self.headless, args=launch_args)
         
-        if context_options:
-            context = self.browser.new_context(**context_options)
-            self.page = context.new_page()
-        else:
-            self.page = self.browser.new_page()
+        # Always use an explicit context so additional pages (prefetch) can share it
+        self.context = self.browser.new_context(**context_options)
+        if self.block_resources:
+            # Registered on the context so prefetch pages are covered too
+            self.context.route("**/*", self._route_request)
+            logger.info("Blocking images, media, fonts and trackers")
+        self.page = self.context.new_page()
         
         self.page.set_default_timeout(self.timeout_ms)
         logger.info("Playwright browser started (headless={}, js_disabled={})", self.headless, self.disable_js)
-        return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         logger.debug("Shutting down Playwright...")
         try:
+            for extra_page in [*self._prefetched.values(), *self._spare_pages]:
+                extra_page.close()
+            self._prefetched.clear()
+            self._spare_pages.clear()
             if self.page:
                 self.page.close()
+            if self.context:
+                self.context.close()
             if self.browser:
                 self.browser.close()
             if self._playwright:
@@ -73,8 +111,22 @@ class BaseScraper(AbstractContextManager):
 
     # --- core navigation helpers ---------------------------------------------------
 
+    def _route_request(self, route: Route) -> None:
+        """Abort heavy or third-party tracking requests, let everything else through."""
+        request = route.request
+        if request.resource_type in self.BLOCKED_RESOURCE_TYPES or any(
+            part in request.url for part in self.BLOCKED_URL_PARTS
+        ):
+            route.abort()
+        else:
+            route.continue_()
+
     def _retry(self, func: Callable[[], None], action_name: str) -> None:
-        """Generic retry wrapper for Playwright actions."""
+        """Generic retry wrapper for Playwright actions.
+
+        Waits `wait_between_retries * 2 ** (attempt - 1)` seconds between attempts
+        (exponential backoff) so a struggling site is not hammered.
+        """
 
         for attempt in range(1, self.max_retries + 1):
             try:
@@ -98,26 +150,81 @@ class BaseScraper(AbstractContextManager):
                 )
 
             if attempt < self.max_retries:
-                time.sleep(self.wait_between_retries)
+                time.sleep(self.wait_between_retries * 2 ** (attempt - 1))
 
         raise RuntimeError(f"Action '{action_name}' failed after {self.max_retries} attempts")
 
     def load_page(self, url: str) -> None:
         """Navigate to a URL with retry logic."""
 
+        if not self.page and self.lazy_browser and self._playwright is None:
+            self._start_browser()
         if not self.page:
             raise RuntimeError("Playwright page is not initialized. Use the scraper as a context manager.")
 
         logger.info("Loading page: {}", url)
 
+        # Use "domcontentloaded" if JS is disabled (faster), otherwise "networkidle"
+        wait_until = "domcontentloaded" if self.disable_js else "networkidle"
+
+        if self._use_prefetched(url, wait_until):
+            return
+
         def _go() -> None:
             assert self.page is not None
-            # Use "domcontentloaded" if JS is disabled (faster), otherwise "networkidle"
-            wait_until = "domcontentloaded" if self.disable_js else "networkidle"
             self.page.goto(url, wait_until=wait_until)
 
         self._retry(_go, f"load_page: {url}")
 
+    def prefetch_page(self, url: str) -> None:
+        """Start navigating a secondary page to `url` without waiting for it to finish loading.
+
+        Only blocks until the response is committed; the rest of the load proceeds in the
+        browser while the caller keeps working with `self.page`. Up to `prefetch_depth`
+        URLs can be in flight at once (the oldest is dropped to make room). A later
+        `load_page(url)` swaps the prefetched page in. Failures are ignored (load_page
+        falls back to goto).
+        """
+        if not self.context or self.prefetch_depth < 1 or url in self._prefetched:
+            return
+
+        while len(self._prefetched) >= self.prefetch_depth:
+            oldest_url = next(iter(self._prefetched))
+            self._spare_pages.append(self._prefetched.pop(oldest_url))
+
+        try:
+            if self._spare_pages:
+                prefetch_page = self._spare_pages.pop()
+            else:
+                prefetch_page = self.context.new_page()
+                prefetch_page.set_default_timeout(self.timeout_ms)
+            self._prefetched[url] = prefetch_page
+            prefetch_page.goto(url, wait_until="commit")
+            logger.debug("Prefetching page: {}", url)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Prefetch failed for {}: {}", url, exc)
+            failed_page = self._prefetched.pop(url, None)
+            if failed_page is not None:
+                self._spare_pages.append(failed_page)
+
+    def _use_prefetched(self, url: str, wait_until: str) -> bool:
+        """Swap in the prefetched page for `url` if there is one and it finishes loading."""
+        prefetch_page = self._prefetched.pop(url, None)
+        if prefetch_page is None:
+            return False
+
+        try:
+            prefetch_page.wait_for_load_state(wait_until)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Prefetched page did not finish loading {}: {}", url, exc)
+            self._spare_pages.append(prefetch_page)
+            return False
+
+        if self.page is not None:
+            self._spare_pages.append(self.page)
+        self.page = prefetch_page
+        return True
+
     def wait_for(self, selector: str, timeout_ms: Optional[int] = None) -> None:
         """Wait for a selector to appear on the page."""
 
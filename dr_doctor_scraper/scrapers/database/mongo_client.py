@@ -1,6 +1,9 @@
 import os
-from typing import Optional, Dict, List
-from pymongo import MongoClient, ASCENDING
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Iterable, List, Set
+from pymongo import MongoClient, ASCENDING, ReturnDocument, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from dotenv import load_dotenv
 from scrapers.logger import logger
 
@@ -12,7 +15,16 @@ class MongoClientManager:
         if not mongo_uri:
             raise ValueError("MONGO_URI missing in .env")
         
-        self.client = MongoClient(mongo_uri)
+        # One pool is shared by all scraper threads; size it above --threads so bulk
+        # flushes and Step 3 lookups do not queue for a free connection
+        wait_queue_timeout = os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+        self.client = MongoClient(
+            mongo_uri,
+            maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+            minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+            waitQueueTimeoutMS=int(wait_queue_timeout) if wait_queue_timeout else None,
+            retryWrites=True,
+        )
         # Use test database if requested
         db_name = "dr_doctor_test" if test_db else "dr_doctor"
         self.db = self.client[db_name]
@@ -71,6 +83,22 @@ class MongoClientManager:
                 self.hospitals.create_index([("name", ASCENDING), ("address", ASCENDING)])
             except Exception:
                 pass  # Non-unique, can fail silently
+
+            # Hospitals: multikey index on doctors.profile_url (Step 3 affiliation lookups)
+            # and scrape_status (Step 2 work queue)
+            try:
+                self.hospitals.create_index([("doctors.profile_url", ASCENDING)])
+                self.hospitals.create_index([("scrape_status", ASCENDING)])
+            except Exception:
+                pass
+
+            # Doctors: index on scrape_status and specialty (Step 3 work queue). Every branch of
+            # that query's $or needs an index, otherwise MongoDB scans the whole collection
+            try:
+                self.doctors.create_index([("scrape_status", ASCENDING)])
+                self.doctors.create_index([("specialty", ASCENDING)])
+            except Exception:
+                pass
             
             # Cities: unique index on url
             try:
@@ -303,7 +331,14 @@ class MongoClientManager:
 
     # ------------ Doctors -----------------
     def doctor_exists(self, url: str) -> bool:
-        return self.doctors.find_one({"profile_url": url}) is not None
+        return self.doctors.find_one({"profile_url": url}, {"_id": 1}) is not None
+
+    def existing_doctor_urls(self, urls: Iterable[str]) -> Set[str]:
+        """Return the subset of `urls` that already have a doctor document (one query)."""
+        url_list = [u for u in urls if u]
+        if not url_list:
+            return set()
+        return {d["profile_url"] for d in self.doctors.find({"profile_url": {"$in": url_list}}, {"_id": 0, "profile_url": 1})}
 
     def insert_doctor(self, doc: Dict) -> Optional[str]:
         """Insert doctor using upsert to prevent duplicates.
@@ -317,21 +352,37 @@ class MongoClientManager:
                 logger.warning("Cannot insert doctor without profile_url")
                 return None
             
-            # Use upsert to prevent duplicates
-            result = self.doctors.update_one(
+            # Upsert and read back the _id in one round trip
+            saved = self.doctors.find_one_and_update(
                 {"profile_url": profile_url},
                 {"$set": doc},
-                upsert=True
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
             )
-            if result.upserted_id:
-                return str(result.upserted_id)
-            # If updated, get the existing document ID
-            existing = self.doctors.find_one({"profile_url": profile_url})
-            return str(existing["_id"]) if existing else None
+            return str(saved["_id"]) if saved else None
         except Exception as exc:
             logger.warning("Failed to insert/update doctor {}: {}", doc.get("profile_url"), exc)
             return None
 
+    @staticmethod
+    def _minimal_doctor_update(name: str) -> List[Dict]:
+        """Build the update pipeline that upserts a minimal doctor record.
+
+        Missing fields are filled in, and `scrape_status` is set to "pending" unless
+        the doctor has already been processed, so existing data is never overwritten.
+        """
+        return [{"$set": {
+            "name": {"$ifNull": ["$name", {"$literal": name}]},
+            "platform": {"$ifNull": ["$platform", "marham"]},
+            "specialty": {"$ifNull": ["$specialty", []]},  # Will be populated during Step 3
+            "scrape_status": {"$cond": [
+                {"$in": [{"$ifNull": ["$scrape_status", None]}, ["processed", "enriched"]]},
+                "$scrape_status",
+                "pending",  # Track that this needs processing
+            ]},
+        }}]
+
     def upsert_minimal_doctor(self, profile_url: str, name: str, hospital_url: Optional[str] = None) -> bool:
         """Insert or update a minimal doctor record (just name + profile_url).
         
@@ -340,35 +391,70 @@ class MongoClientManager:
         Only sets minimal fields if doctor doesn't exist.
         """
         try:
-            existing = self.doctors.find_one({"profile_url": profile_url})
-            if existing:
-                # Doctor already exists - don't overwrite existing data
-                # Only update scrape_status if it's missing or still "pending"
-                if existing.get("scrape_status") not in ["processed", "enriched"]:
-                    self.doctors.update_one(
-                        {"profile_url": profile_url},
-                        {"$set": {"scrape_status": "pending"}}
-                    )
-                return True
-            
-            # Insert minimal record only if doctor doesn't exist
-            minimal_doc = {
-                "profile_url": profile_url,
-                "name": name,
-                "platform": "marham",
-                "specialty": [],  # Will be populated during Step 3
-                "scrape_status": "pending"  # Track that this needs processing
-            }
-            self.doctors.insert_one(minimal_doc)
+            self.doctors.update_one(
+                {"profile_url": profile_url}, self._minimal_doctor_update(name), upsert=True
+            )
             return True
         except Exception as exc:
-            # Handle duplicate key errors (shouldn't happen with proper check)
             logger.warning("Failed to upsert minimal doctor {}: {}", profile_url, exc)
             return False
 
+    def upsert_minimal_doctors(self, doctors: List[Dict]) -> int:
+        """Batch version of `upsert_minimal_doctor` for all doctors found on one hospital.
+
+        Sends one conditional upsert per doctor in a single bulk write, so known
+        doctors are not read first.
+
+        Args:
+            doctors: Dictionaries with `profile_url` and `name`
+
+        Returns:
+            Number of doctors inserted or reset to "pending"
+        """
+        names = {d["profile_url"]: d.get("name") or "" for d in doctors if d.get("profile_url")}
+        operations = [
+            UpdateOne({"profile_url": profile_url}, self._minimal_doctor_update(name), upsert=True)
+            for profile_url, name in names.items()
+        ]
+        return self.bulk_update(self.doctors, operations)
+
     # ------------ Hospitals -----------------
     def hospital_exists(self, name: str, address: str) -> bool:
-        return self.hospitals.find_one({"name": name, "address": address}) is not None
+        return self.hospitals.find_one({"name": name, "address": address}, {"_id": 1}) is not None
+
+    def existing_hospital_urls(self, urls: Iterable[str]) -> Set[str]:
+        """Return the subset of `urls` that already have a hospital document (one query)."""
+        url_list = [u for u in urls if u]
+        if not url_list:
+            return set()
+        return {d["url"] for d in self.hospitals.find({"url": {"$in": url_list}}, {"_id": 0, "url": 1})}
+
+    def get_hospital_affiliations(self, profile_urls: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Find the hospitals listing each doctor in their `doctors` array, for many doctors at once.
+
+        Args:
+            profile_urls: Doctor profile URLs
+
+        Returns:
+            Mapping of profile_url to a list of `{"url", "name"}` hospital dicts
+            (doctors without affiliations are left out)
+        """
+        wanted = {u for u in profile_urls if u}
+        affiliations: Dict[str, List[Dict]] = {}
+        if not wanted:
+            return affiliations
+
+        cursor = self.hospitals.find(
+            {"doctors.profile_url": {"$in": list(wanted)}},
+            {"_id": 0, "url": 1, "name": 1, "doctors.profile_url": 1},
+        )
+        for hosp in cursor:
+            hosp_ref = {"url": hosp.get("url"), "name": hosp.get("name", "")}
+            for doc in hosp.get("doctors") or []:
+                profile_url = doc.get("profile_url") if isinstance(doc, dict) else None
+                if profile_url in wanted:
+                    affiliations.setdefault(profile_url, []).append(hosp_ref)
+        return affiliations
 
     def insert_hospital(self, doc: Dict) -> Optional[str]:
         try:
@@ -388,9 +474,17 @@ class MongoClientManager:
     def update_hospital(self, url: Optional[str], doc: Dict) -> bool:
         """Update hospital document by `url` (primary method).
 
-        Performs an upsert so minimal entries inserted earlier will be enriched.
-        URL is the unique identifier to prevent duplicates.
-        Returns True on success, False otherwise.
+        URL is the unique identifier to prevent duplicates. One upserting pipeline
+        update compares the stored hospital with `doc` on the server and keeps every
+        field as is when nothing differs, so an unchanged hospital costs a single
+        round trip and no write. If `doc` carries a `content_hash`, only that hash is
+        compared, so the rest of `doc` (including `scrape_status`) is only written
+        along with changed content; callers set the status separately. A hospital
+        not stored yet is inserted.
+
+        Returns:
+            True if the hospital was inserted or modified, False if nothing changed
+            or the update failed (failures are logged)
         """
         try:
             # URL is required for proper deduplication
@@ -398,44 +492,129 @@ class MongoClientManager:
             if not hospital_url:
                 logger.warning("Cannot update hospital without URL: {}", doc.get("name"))
                 return False
-            
-            # Use URL as the unique identifier (prevents duplicates)
-            result = self.hospitals.update_one(
-                {"url": hospital_url}, 
-                {"$set": doc}, 
-                upsert=True
-            )
-            return bool(result.raw_result.get("ok", 0))
+
+            if doc.get("content_hash"):
+                unchanged = {"$eq": ["$content_hash", doc["content_hash"]]}
+            else:
+                compared = [k for k in doc if k not in ("_id", "url", "scraped_at")]
+                unchanged = {"$and": [{"$eq": [f"${k}", {"$literal": doc[k]}]} for k in compared]}
+            # Each field keeps its stored value when unchanged; a new hospital never matches
+            # (no stored hash or fields), so the upsert inserts all of `doc`
+            fields = {
+                k: {"$cond": [unchanged, f"${k}", {"$literal": v}]}
+                for k, v in doc.items()
+                if k not in ("_id", "url")
+            }
+            try:
+                result = self.hospitals.update_one({"url": hospital_url}, [{"$set": fields}], upsert=True)
+            except DuplicateKeyError:
+                # Another writer inserted it in between; apply the same update to that copy
+                result = self.hospitals.update_one({"url": hospital_url}, [{"$set": fields}])
+            return result.upserted_id is not None or result.modified_count > 0
         except Exception as exc:
-            # Handle duplicate key errors gracefully
             logger.warning("Failed to update hospital {}: {}", doc.get("name"), exc)
             return False
 
-    def get_hospitals_needing_enrichment(self, limit: Optional[int] = None):
-        """Get hospitals that need enrichment (status is 'pending' or missing)."""
+    def add_hospital_doctors(self, url: str, doctors: List[Dict], status: Optional[str] = None) -> bool:
+        """Append doctors to a hospital's `doctors` list unless already listed (by profile_url).
+
+        The merge runs server-side in one pipeline update, so the existing list is
+        never read back and concurrent writers cannot drop each other's entries.
+        Entries already present (possibly enriched with fee/timings) are left as is.
+
+        Args:
+            url: Hospital URL
+            doctors: Dictionaries with at least `profile_url`
+            status: Optional `scrape_status` to set in the same update
+
+        Returns:
+            True on success, False otherwise
+        """
+        new_doctors = [d for d in doctors if d.get("profile_url")]
+        listed = {"$ifNull": ["$doctors", []]}
+        fields: Dict = {
+            "doctors": {"$concatArrays": [
+                listed,
+                {"$filter": {
+                    "input": {"$literal": new_doctors},
+                    "as": "d",
+                    "cond": {"$not": [{"$in": ["$$d.profile_url", {"$ifNull": ["$doctors.profile_url", []]}]}]},
+                }},
+            ]},
+        }
+        if status:
+            fields["scrape_status"] = status
+        try:
+            self.hospitals.update_one({"url": url}, [{"$set": fields}], upsert=True)
+            return True
+        except Exception as exc:
+            logger.warning("Failed to add doctors to hospital {}: {}", url, exc)
+            return False
+
+    def get_hospitals_needing_enrichment(self, limit: Optional[int] = None, projection: Optional[Dict] = None):
+        """Get hospitals that need enrichment (status is 'pending' or missing).
+
+        Pass `projection` to fetch only the fields the caller reads.
+        """
         query = {"$or": [{"scrape_status": {"$exists": False}}, {"scrape_status": "pending"}]}
-        cursor = self.hospitals.find(query).sort("_id", ASCENDING)
+        cursor = self.hospitals.find(query, projection).sort("_id", ASCENDING)
         if limit:
             cursor = cursor.limit(limit)
         return cursor
 
-    def get_hospitals_needing_doctor_collection(self, limit: Optional[int] = None):
-        """Get hospitals that need doctor collection (status is 'enriched' but not 'doctors_collected')."""
+    def get_hospitals_needing_doctor_collection(
+        self,
+        limit: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        no_cursor_timeout: bool = False,
+        projection: Optional[Dict] = None,
+    ):
+        """Get hospitals that need doctor collection (status is 'enriched' but not 'doctors_collected').
+
+        The cursor is returned unmaterialized so callers can stream it. Pass
+        `no_cursor_timeout=True` for long-running loops and close the cursor when done.
+        Pass `projection` to fetch only the fields the caller reads.
+        """
         query = {"scrape_status": {"$in": ["enriched", "pending"]}}
-        cursor = self.hospitals.find(query).sort("_id", ASCENDING)
+        cursor = self.hospitals.find(query, projection, no_cursor_timeout=no_cursor_timeout).sort("_id", ASCENDING)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
         if limit:
             cursor = cursor.limit(limit)
         return cursor
 
-    def get_doctors_needing_processing(self, limit: Optional[int] = None):
-        """Get doctors that need full processing (status is 'pending' or missing)."""
+    def get_doctors_needing_processing(
+        self,
+        limit: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        no_cursor_timeout: bool = False,
+        projection: Optional[Dict] = None,
+        fresh_within: Optional[timedelta] = None,
+    ):
+        """Get doctors that need full processing (status is 'pending' or missing).
+
+        The cursor is returned unmaterialized so callers can stream it. Pass
+        `no_cursor_timeout=True` for long-running loops and close the cursor when done.
+        Pass `projection` to fetch only the fields the caller reads.
+
+        Doctors whose profile has no specialty are retried as well; with
+        `fresh_within`, only once their `scraped_at` is older than that.
+        """
+        missing_specialty: Dict = {"$or": [{"specialty": {"$exists": False}}, {"specialty": []}]}
+        if fresh_within is not None:
+            cutoff = datetime.utcnow() - fresh_within
+            missing_specialty = {"$and": [
+                missing_specialty,
+                {"$or": [{"scraped_at": {"$exists": False}}, {"scraped_at": {"$lt": cutoff}}]},
+            ]}
         query = {"$or": [
             {"scrape_status": {"$exists": False}},
             {"scrape_status": "pending"},
-            {"specialty": {"$exists": False}},
-            {"specialty": []}
+            missing_specialty,
         ]}
-        cursor = self.doctors.find(query).sort("_id", ASCENDING)
+        cursor = self.doctors.find(query, projection, no_cursor_timeout=no_cursor_timeout).sort("_id", ASCENDING)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
         if limit:
             cursor = cursor.limit(limit)
         return cursor
@@ -465,7 +644,7 @@ class MongoClientManager:
     # ------------ Cities -----------------
     def city_exists(self, url: str) -> bool:
         """Check if city exists by URL."""
-        return self.cities.find_one({"url": url}) is not None
+        return self.cities.find_one({"url": url}, {"_id": 1}) is not None
 
     def upsert_city(self, name: str, url: str) -> bool:
         """Insert or update a city record.
@@ -711,6 +890,37 @@ class MongoClientManager:
             logger.debug("Failed to upsert asset {}: {}", asset_data.get("url"), exc)
             return False
     
+    def bulk_update(self, collection: Collection, operations: List) -> int:
+        """Send a batch of write operations in one unordered `bulk_write`.
+
+        Rows that fail (e.g. duplicate keys) are logged and skipped; the rest
+        of the batch is still applied.
+
+        Args:
+            collection: Target collection (e.g. `self.doctors`)
+            operations: List of pymongo write operations (UpdateOne, InsertOne, ...)
+
+        Returns:
+            Number of documents inserted/updated
+        """
+        if not operations:
+            return 0
+
+        try:
+            result = collection.bulk_write(operations, ordered=False)
+            return result.modified_count + result.upserted_count + result.inserted_count
+        except BulkWriteError as exc:
+            details = exc.details or {}
+            for error in details.get("writeErrors", []):
+                logger.warning(
+                    "Bulk write to {} skipped row {}: {}",
+                    collection.name, error.get("index"), error.get("errmsg"),
+                )
+            return details.get("nModified", 0) + details.get("nUpserted", 0) + details.get("nInserted", 0)
+        except Exception as exc:
+            logger.warning("Failed bulk write of {} operations to {}: {}", len(operations), collection.name, exc)
+            return 0
+
     def bulk_upsert_crawled_assets(self, assets: List[Dict]) -> int:
         """Bulk upsert crawled assets.
         
@@ -724,7 +934,6 @@ class MongoClientManager:
             return 0
         
         try:
-            from pymongo import UpdateOne
             operations = []
             
             for asset in assets:
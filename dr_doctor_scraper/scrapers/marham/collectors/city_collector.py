@@ -4,9 +4,9 @@ from __future__ import annotations
 
 import requests
 from typing import List, Dict
-from bs4 import BeautifulSoup
 
 from scrapers.logger import logger
+from scrapers.utils.parser_helpers import make_soup
 
 BASE_URL = "https://www.marham.pk"
 HOSPITALS_PAGE = f"{BASE_URL}/hospitals"
@@ -36,7 +36,7 @@ class CityCollector:
             logger.error("Failed to fetch hospitals page: {}", exc)
             return []
         
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = make_soup(response.text)
         cities = []
         
         # Extract cities from "Top Cities" section
@@ -2,45 +2,103 @@
 
 from __future__ import annotations
 
-import time
-from typing import List
-from bs4 import BeautifulSoup
+from typing import List, Optional
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from scrapers.base_scraper import BaseScraper
 from scrapers.logger import logger
+from scrapers.utils.parser_helpers import make_soup
+
+# Hospital pages grow large after "Load More"; only the doctor cards are built into a tree
+_CARD_STRAINER = SoupStrainer(class_="shadow-card")
+_CARD_SEL = sv.compile(".row.shadow-card")
+
+# Present in server-rendered hospital pages (doctor cards); absent when the cards still need JS
+_RENDERED_HOSPITAL_MARKER = "dr_profile_opened_from_hospital_profile"
+# Hospital pages mentioning the Load More button need the browser to list every doctor
+_LOAD_MORE_MARKER = "loadMore"
+
+# How long to wait for a Load More click to add cards before treating the list as complete
+LOAD_MORE_TIMEOUT_MS = 5000
+_MORE_CARDS_JS = "(before) => document.querySelectorAll('.row.shadow-card').length > before"
 
 
 class DoctorCollector:
     """Collects doctor cards from hospital pages, handling dynamic loading."""
 
     @staticmethod
-    def collect_doctor_cards_from_hospital(scraper: BaseScraper, hospital_url: str) -> List[BeautifulSoup]:
+    def is_rendered_hospital(html: str) -> bool:
+        """Return True if hospital page HTML already contains doctor cards.
+
+        Args:
+            html: Hospital page HTML (e.g. from a plain HTTP request)
+
+        Returns:
+            True if the doctor cards are server-rendered
+        """
+        return _RENDERED_HOSPITAL_MARKER in html
+
+    @staticmethod
+    def has_load_more(html: str) -> bool:
+        """Return True if the hospital page has a "Load More" button (more doctors than shown).
+
+        Args:
+            html: Hospital page HTML
+
+        Returns:
+            True if the full doctor list can only be loaded in the browser
+        """
+        return _LOAD_MORE_MARKER in html
+
+    @staticmethod
+    def parse_doctor_cards(html: str) -> List[BeautifulSoup]:
+        """Parse the doctor cards present in hospital page HTML (no Load More clicks).
+
+        Args:
+            html: Hospital page HTML
+
+        Returns:
+            List of BeautifulSoup Tag objects representing doctor cards
+        """
+        return _CARD_SEL.select(make_soup(html, parse_only=_CARD_STRAINER))
+
+    @staticmethod
+    def collect_doctor_cards_from_hospital(
+        scraper: BaseScraper, hospital_url: str, html: Optional[str] = None
+    ) -> List[BeautifulSoup]:
         """Load the hospital page and attempt to collect all doctor cards.
 
         Strategy:
-        - Load initial page and gather cards.
+        - Load initial page (unless it is already open) and gather cards.
         - If a "Load More" button exists, click it repeatedly until it disappears
-          or a safety limit is reached. Wait for loading buffer to disappear.
+          or a safety limit is reached. After each click, wait until the card
+          count grows (up to LOAD_MORE_TIMEOUT_MS).
         - Return list of card elements (BeautifulSoup Tag objects).
 
         Args:
             scraper: BaseScraper instance with active page
             hospital_url: URL of the hospital page to scrape
+            html: HTML of `hospital_url` when the scraper's page already shows it;
+                skips reloading the page
 
         Returns:
             List of BeautifulSoup Tag objects representing doctor cards
         """
-        scraper.load_page(hospital_url)
-        scraper.wait_for("body")
-        html = scraper.get_html()
-        soup = BeautifulSoup(html, "html.parser")
-        cards = soup.select(".row.shadow-card")
+        if html is None:
+            scraper.load_page(hospital_url)
+            scraper.wait_for("body")
+            html = scraper.get_html()
+        cards = DoctorCollector.parse_doctor_cards(html)
 
-        # If the page uses a client-side "Load More" button, try to click it via Playwright
+        # If the page uses a client-side "Load More" button, click it via Playwright. Progress is
+        # tracked with a card count in the page; the HTML is re-read and parsed once at the end.
         try:
             if scraper.page and scraper.page.query_selector("#loadMore"):
                 logger.info("'Load More' detected on {} — clicking until exhausted", hospital_url)
                 initial_card_count = len(cards)
+                cards_before = initial_card_count
                 logger.info("Initial cards found: {}", initial_card_count)
                 
                 clicks = 0
@@ -61,131 +119,31 @@ class DoctorCollector:
                         break
                     
                     try:
-                        logger.info("=" * 60)
-                        logger.info("Clicking Load More button (click #{})...", clicks + 1)
-                        
-                        # Get card count before clicking
-                        cards_before = len(cards)
-                        logger.info("Cards before click: {}", cards_before)
-                        
-                        # Click the button
                         load_more_button.click()
-                        logger.info("Button clicked! Waiting for content to load...")
-                        
-                        # Wait a moment for the click to register
-                        time.sleep(0.5)
-                        
-                        # Wait for loading indicators to appear and disappear, or new cards to load
-                        max_wait = 5  # Reduced to 5 seconds as requested
-                        waited = 0
-                        loading_detected = False
-                        loading_visible = False
-                        check_interval = 0.5  # Check every 0.5 seconds
+                        logger.debug("Clicked Load More (click #{}), {} cards so far", clicks + 1, cards_before)
                         
-                        logger.info("Monitoring loading state (max wait: {}s)...", max_wait)
-                        
-                        while waited < max_wait:
-                            # Check if new cards have been loaded (early exit if content is ready)
-                            try:
-                                html_check = scraper.get_html()
-                                soup_check = BeautifulSoup(html_check, "html.parser")
-                                current_cards = soup_check.select(".row.shadow-card")
-                                if len(current_cards) > cards_before:
-                                    logger.info("✓ New cards detected! ({}) cards now (was {}). Content loaded after {:.1f} seconds", 
-                                              len(current_cards), cards_before, waited)
-                                    break
-                            except Exception:
-                                pass  # Continue waiting if check fails
-                            
-                            # Check for various loading indicators
-                            loading_selectors = [
-                                ".loader",
-                                ".loading", 
-                                ".spinner",
-                                "[class*='load']",
-                                "[class*='spin']",
-                                "[class*='Loading']",
-                                "[id*='load']",
-                                "[id*='Loading']"
-                            ]
-                            
-                            loading_elements = []
-                            for selector in loading_selectors:
-                                try:
-                                    elements = scraper.page.query_selector_all(selector)
-                                    visible_elements = [e for e in elements if e.is_visible()]
-                                    if visible_elements:
-                                        loading_elements.extend(visible_elements)
-                                except Exception:
-                                    pass
-                            
-                            if loading_elements:
-                                if not loading_detected:
-                                    logger.info("✓ Loading indicator detected! Waiting for it to disappear...")
-                                    loading_detected = True
-                                loading_visible = True
-                                time.sleep(check_interval)
-                                waited += check_interval
-                            else:
-                                if loading_visible:
-                                    logger.info("✓ Loading indicator disappeared after {:.1f} seconds", waited)
-                                elif loading_detected:
-                                    logger.info("✓ Loading complete (no indicator found) after {:.1f} seconds", waited)
-                                # Even if no loading indicator, wait a bit more to ensure content is loaded
-                                if waited < 1.0:  # Wait at least 1 second
-                                    time.sleep(check_interval)
-                                    waited += check_interval
-                                else:
-                                    break
-                            
-                            if waited % 1 == 0 and waited > 0:
-                                logger.info("  Still waiting... ({:.1f}/{}s)", waited, max_wait)
-                        
-                        if waited >= max_wait:
-                            logger.info("⚠ Max wait time reached ({}s). Checking if content loaded anyway...", max_wait)
-                        
-                        # Wait for DOM to settle
-                        logger.info("Waiting for DOM to settle...")
-                        time.sleep(1)
-                        
-                        # Try to wait for network idle (with shorter timeout)
+                        # Returns as soon as the new cards are in the DOM instead of sleeping a fixed time
                         try:
-                            logger.info("Waiting for network to be idle...")
-                            scraper.page.wait_for_load_state("networkidle", timeout=5000)
-                            logger.info("✓ Network idle")
-                        except Exception:
-                            logger.debug("Network idle timeout (this is usually fine)")
-                        
-                        # Final wait for any animations/transitions
-                        time.sleep(0.5)
-                        
-                        # Get updated HTML and count new cards
-                        html = scraper.get_html()
-                        soup = BeautifulSoup(html, "html.parser")
-                        new_cards = soup.select(".row.shadow-card")
-                        cards_after = len(new_cards)
-                        
-                        logger.info("Cards after click: {}", cards_after)
-                        new_cards_count = cards_after - cards_before
-                        
-                        if new_cards_count > 0:
-                            logger.info("✓ SUCCESS: {} new cards loaded! (Total: {})", new_cards_count, cards_after)
-                            cards = new_cards
-                            clicks += 1
-                        else:
-                            logger.info("⚠ No new cards loaded. Load More may be exhausted or failed.")
-                            # Check if button still exists
-                            if scraper.page.query_selector("#loadMore"):
-                                logger.info("  Button still exists, but no new content. Stopping.")
+                            scraper.page.wait_for_function(
+                                _MORE_CARDS_JS, arg=cards_before, timeout=LOAD_MORE_TIMEOUT_MS
+                            )
+                        except PlaywrightTimeoutError:
+                            logger.info("No new cards after {} ms. Load More is exhausted or failed.", LOAD_MORE_TIMEOUT_MS)
                             break
                         
-                        logger.info("=" * 60)
+                        cards_after = scraper.page.eval_on_selector_all(".row.shadow-card", "els => els.length")
+                        logger.info("Load More click #{}: {} new cards (total: {})", clicks + 1, cards_after - cards_before, cards_after)
+                        cards_before = cards_after
+                        clicks += 1
                         
                     except Exception as exc:  # noqa: BLE001
                         logger.error("✗ Error clicking Load More on {}: {}", hospital_url, exc)
                         logger.exception("Full error details:")
                         break
                 
+                if cards_before > initial_card_count:
+                    cards = DoctorCollector.parse_doctor_cards(scraper.get_html())
+                
                 final_card_count = len(cards)
                 total_loaded = final_card_count - initial_card_count
                 logger.info("Load More process complete: {} clicks, {} total cards loaded ({} new)", 
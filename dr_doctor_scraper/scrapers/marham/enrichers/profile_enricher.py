@@ -3,19 +3,57 @@
 from __future__ import annotations
 
 import re
-from typing import List, Optional
-from bs4 import BeautifulSoup
+from typing import Callable, List, Optional
+import soupsieve as sv
+from bs4 import BeautifulSoup, Tag
 
 from scrapers.models.doctor_model import DoctorModel
-from scrapers.utils.parser_helpers import clean_text
+from scrapers.utils.parser_helpers import clean_text, make_soup
 from scrapers.utils.url_parser import is_hospital_url, is_video_consultation_url, parse_hospital_url
 
 BASE_URL = "https://www.marham.pk"
 
+# Present in server-rendered profile pages (practice cards); absent when the page still needs JS
+_RENDERED_PROFILE_MARKER = "practice_detail_card_dr_profile_tapped"
+
+# Practice-card selectors, compiled once at import (run for every practice of every doctor)
+_PRACTICE_CARD_SEL = sv.compile("div.mt-4.row.cursor-pointer")
+_ONLINE_LINK_SEL = sv.compile("a.oc_practice_detail_card_dr_profile_tapped")
+_CLINIC_LINK_SEL = sv.compile("a.pc_practice_detail_card_dr_profile_tapped")
+_AREA_SEL = sv.compile("p:-soup-contains('Area:')")
+_TIMING_ROW_SEL = sv.compile("table tr")
+_MAP_IFRAME_SEL = sv.compile("iframe.google-map, iframe[src*='maps.google.com'], iframe[data-src*='maps.google.com']")
+_MAPS_COORDS_RE = re.compile(r'[?&]q=([\d.-]+),([\d.-]+)|/@([\d.-]+),([\d.-]+)')
+# First amount next to "Rs" in a fee paragraph: "Rs. 1,500", "Rs 1 500" or "1500 Rs" -> 1500
+# (a range such as "Rs. 1,500 - 2,000" gives its lower bound)
+_FEE_AMOUNT = r'(\d{1,3}(?:[, ]\d{3})+|\d+)'
+_FEE_RE = re.compile(rf'Rs\.?\s*{_FEE_AMOUNT}|{_FEE_AMOUNT}\s*Rs\b')
+_FEE_SEPARATORS_RE = re.compile(r'[, ]')
+# "20 Yrs Experience", "20+ Years Experience" or "20 Years of Experience" in the profile intro
+_EXPERIENCE_YEARS_RE = re.compile(r'(\d+)\s*\+?\s*(?:Yrs|Years)\s+(?:of\s+)?Experience')
+
+# Profile-section list selectors (services, diseases, symptoms)
+_GRID_LIST_SEL = sv.compile("ul.grid-list")
+_SERVICE_LINK_SEL = sv.compile("a.sevice_dr_profile_clicked, a")
+_DISEASE_LINK_SEL = sv.compile("a.disease_dr_profile_clicked, a")
+_SYMPTOM_ITEM_SEL = sv.compile("li.symptom_dr_profile_clicked, li")
+
 
 class ProfileEnricher:
     """Enriches doctor profiles with detailed information from profile pages."""
 
+    @staticmethod
+    def is_rendered_profile(html: str) -> bool:
+        """Return True if the HTML already contains the profile markup `parse_doctor_profile` reads.
+
+        Args:
+            html: HTML content of a doctor's profile page (e.g. a plain HTTP response)
+
+        Returns:
+            True if the page can be parsed without rendering it in a browser
+        """
+        return _RENDERED_PROFILE_MARKER in html
+
     @staticmethod
     def parse_doctor_profile(html: str) -> dict:
         """Parse a doctor's profile page HTML for specialties, PMDC verification, practices, etc.
@@ -29,7 +67,7 @@ class ProfileEnricher:
             professional_statement, patients_treated, reviews_count, patient_satisfaction_score,
             phone, consultation_types
         """
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         result = {"specialties": [], "pmdc_verified": False}
 
         # PMDC verified badge: look for a green text badge containing 'PMDC' or 'PMDC Verified'
@@ -92,106 +130,111 @@ class ProfileEnricher:
         practices = []
         try:
             # Find section by header text "Practice Address and Timings"
-            sections = soup.select("section")
+            sections = soup.find_all("section")
             target = None
             for sec in sections:
-                h2 = sec.select_one("h2")
+                h2 = sec.find("h2")
                 if h2 and "Practice Address" in h2.get_text():
                     target = sec
                     break
 
             if not target:
                 # fallback: search by class or h2 text
-                target = soup.select_one("section.p-xy") or soup.select_one("section")
+                target = soup.select_one("section.p-xy") or soup.find("section")
 
             if target:
-                cards = target.select("div.mt-4.row.cursor-pointer")
-                for c in cards:
-                    try:
-                        h_id = c.get("h_id")
-                        d_id = c.get("d_id")
-                        
-                        # Check if this is a video consultation (private practice)
-                        oc_link = c.select_one("a.oc_practice_detail_card_dr_profile_tapped")
-                        pc_link = c.select_one("a.pc_practice_detail_card_dr_profile_tapped")
-                        
-                        hospital_name_tag = c.select_one("h3")
-                        hospital_name = clean_text(hospital_name_tag.get_text()) if hospital_name_tag else None
-                        
-                        # Determine if this is video consultation
-                        is_private_practice = False
-                        if oc_link or (hospital_name and "Video Consultation" in hospital_name):
-                            is_private_practice = True
-                        
-                        # Get the appropriate link
-                        practice_link = oc_link if oc_link else pc_link
-                        practice_url = None
-                        if practice_link and practice_link.has_attr("href"):
-                            practice_url = practice_link.get("href")
-                            if practice_url and practice_url.startswith("/"):
-                                practice_url = f"{BASE_URL}{practice_url}"
-                        
-                        # For hospitals, extract hospital URL from the link
-                        # Hospital links look like: /doctors/karachi/urologist/dr-feroze-ahmed-mahar/callcenter?h_id=5907
-                        # We need to construct the actual hospital URL from h_id or extract it
-                        hospital_url = None
-                        if not is_private_practice and practice_url:
-                            # Try to extract hospital URL from the practice link
-                            # If it contains 'callcenter?h_id=', we can construct hospital URL
-                            if "callcenter" in practice_url or "h_id" in practice_url:
-                                # For now, use the practice_url as hospital_url
-                                # The actual hospital URL might need to be looked up separately
-                                hospital_url = practice_url
-                        
-                        # area (only for hospitals, not video consultations)
-                        area = None
-                        if not is_private_practice:
-                            area = ProfileEnricher._extract_area(c)
-
-                        # fee
-                        fee = ProfileEnricher._extract_fee(c)
-
-                        # timings: table rows under this card
-                        timings = ProfileEnricher._extract_timings(c)
-
-                        # location: extract from Google Maps iframe (only for hospitals)
-                        lat, lng = None, None
-                        if not is_private_practice:
-                            lat, lng = ProfileEnricher._extract_location(c)
-
-                        practices.append({
-                            "h_id": h_id,
-                            "d_id": d_id,
-                            "hospital_name": hospital_name,
-                            "hospital_url": hospital_url,
-                            "practice_url": practice_url,  # The booking/appointment URL
-                            "area": area,
-                            "fee": fee,
-                            "timings": timings,
-                            "lat": lat,
-                            "lng": lng,
-                            "is_private_practice": is_private_practice,
-                        })
-                    except Exception as exc:  # noqa: BLE001
-                        from scrapers.logger import logger
-                        logger.debug("Error parsing practice card: {}", exc)
-                        continue
+                cards = _PRACTICE_CARD_SEL.select(target)
+                practices = [practice for practice in map(ProfileEnricher._parse_practice_card, cards) if practice]
         except Exception as exc:  # noqa: BLE001
             from scrapers.logger import logger
             logger.debug("Error parsing practices section: {}", exc)
 
         return practices
 
+    @staticmethod
+    def _parse_practice_card(card: BeautifulSoup) -> Optional[dict]:
+        """Parse one practice card (hospital or video consultation) into a practice dict.
+
+        Args:
+            card: Practice card element (div.mt-4.row.cursor-pointer)
+
+        Returns:
+            Practice dict, or None if the card could not be parsed
+        """
+        try:
+            h_id = card.get("h_id")
+            d_id = card.get("d_id")
+
+            # Check if this is a video consultation (private practice)
+            oc_link = _ONLINE_LINK_SEL.select_one(card)
+            pc_link = _CLINIC_LINK_SEL.select_one(card)
+
+            hospital_name_tag = card.find("h3")
+            hospital_name = clean_text(hospital_name_tag.get_text()) if hospital_name_tag else None
+
+            # Determine if this is video consultation
+            is_private_practice = False
+            if oc_link or (hospital_name and "Video Consultation" in hospital_name):
+                is_private_practice = True
+
+            # Get the appropriate link
+            practice_link = oc_link if oc_link else pc_link
+            practice_url = None
+            if practice_link and practice_link.has_attr("href"):
+                practice_url = practice_link.get("href")
+                if practice_url and practice_url.startswith("/"):
+                    practice_url = f"{BASE_URL}{practice_url}"
+
+            # For hospitals, extract hospital URL from the link
+            # Hospital links look like: /doctors/karachi/urologist/dr-feroze-ahmed-mahar/callcenter?h_id=5907
+            # We need to construct the actual hospital URL from h_id or extract it
+            hospital_url = None
+            if not is_private_practice and practice_url:
+                # Try to extract hospital URL from the practice link
+                # If it contains 'callcenter?h_id=', we can construct hospital URL
+                if "callcenter" in practice_url or "h_id" in practice_url:
+                    # For now, use the practice_url as hospital_url
+                    # The actual hospital URL might need to be looked up separately
+                    hospital_url = practice_url
+
+            # area (only for hospitals, not video consultations)
+            area = None
+            if not is_private_practice:
+                area = ProfileEnricher._extract_area(card)
+
+            # fee
+            fee = ProfileEnricher._extract_fee(card)
+
+            # timings: table rows under this card
+            timings = ProfileEnricher._extract_timings(card)
+
+            # location: extract from Google Maps iframe (only for hospitals)
+            lat, lng = None, None
+            if not is_private_practice:
+                lat, lng = ProfileEnricher._extract_location(card)
+
+            return {
+                "h_id": h_id,
+                "d_id": d_id,
+                "hospital_name": hospital_name,
+                "hospital_url": hospital_url,
+                "practice_url": practice_url,  # The booking/appointment URL
+                "area": area,
+                "fee": fee,
+                "timings": timings,
+                "lat": lat,
+                "lng": lng,
+                "is_private_practice": is_private_practice,
+            }
+        except Exception as exc:  # noqa: BLE001
+            from scrapers.logger import logger
+            logger.debug("Error parsing practice card: {}", exc)
+            return None
+
     @staticmethod
     def _extract_area(card: BeautifulSoup) -> Optional[str]:
         """Extract area from practice card."""
-        area_tag = card.select_one("p:contains('Area:')")
-        if not area_tag:
-            # try generic p containing 'Area'
-            for p in card.select("p"):
-                if "Area:" in p.get_text():
-                    area_tag = p
-                    break
+        area_tag = _AREA_SEL.select_one(card)
         if area_tag:
             area_text = area_tag.get_text()
             # extract after 'Area:'
@@ -202,24 +245,22 @@ class ProfileEnricher:
 
     @staticmethod
     def _extract_fee(card: BeautifulSoup) -> Optional[int]:
-        """Extract fee from practice card."""
-        fee_tag = None
-        for p in card.select("p"):
-            t = p.get_text()
-            if "Rs." in t or "Rs" in t:
-                fee_tag = p
-                break
-        if fee_tag:
-            digits = "".join(ch for ch in fee_tag.get_text() if ch.isdigit())
-            return int(digits) if digits else None
+        """Extract fee from the first paragraph of a practice card that mentions "Rs"."""
+        for p in card.find_all("p"):
+            text = p.get_text()
+            if "Rs" in text:
+                match = _FEE_RE.search(text)
+                if not match:
+                    return None
+                return int(_FEE_SEPARATORS_RE.sub("", match.group(1) or match.group(2)))
         return None
 
     @staticmethod
     def _extract_timings(card: BeautifulSoup) -> dict:
         """Extract timings from practice card."""
         timings = {}
-        for tr in card.select("table tr"):
-            tds = tr.select("td")
+        for tr in _TIMING_ROW_SEL.select(card):
+            tds = tr.find_all("td")
             if len(tds) >= 2:
                 day = clean_text(tds[0].get_text())
                 time_text = clean_text(tds[1].get_text())
@@ -239,7 +280,7 @@ class ProfileEnricher:
         lng = None
         
         # Look for Google Maps iframe
-        iframe = card.select_one("iframe.google-map, iframe[src*='maps.google.com'], iframe[data-src*='maps.google.com']")
+        iframe = _MAP_IFRAME_SEL.select_one(card)
         
         if iframe:
             # First try data attributes
@@ -260,7 +301,7 @@ class ProfileEnricher:
             
             if src:
                 # Pattern: q=lat,lng or /@lat,lng
-                coords_match = re.search(r'[?&]q=([\d.-]+),([\d.-]+)|/@([\d.-]+),([\d.-]+)', src)
+                coords_match = _MAPS_COORDS_RE.search(src)
                 if coords_match:
                     try:
                         lat = float(coords_match.group(1) or coords_match.group(3))
@@ -273,6 +314,19 @@ class ProfileEnricher:
         
         return lat, lng
 
+    @staticmethod
+    def _find_section(soup: BeautifulSoup, heading: Callable[[str], bool]) -> Optional[Tag]:
+        """Return the div enclosing the first <h2> whose text satisfies `heading`.
+
+        Profile sections are cards headed by an <h2>; walking the page's <h2> elements
+        once is much cheaper than testing every <div> (and its subtree) for a heading.
+        """
+        for h2 in soup.find_all("h2"):
+            text = clean_text(h2.get_text())
+            if text and heading(text):
+                return h2.find_parent("div")
+        return None
+
     @staticmethod
     def _parse_qualifications(soup: BeautifulSoup) -> List[dict]:
         """Parse qualifications from Qualification table.
@@ -293,35 +347,17 @@ class ProfileEnricher:
         qualifications = []
         try:
             # Find the Qualification section - look for div containing h2 with "Qualification"
-            # Try specific selector first (more reliable)
-            qualification_sections = soup.select("div.bg-marham-light-border.shadow-card, div.col-12.col-md-12")
-            
-            target_section = None
-            for div in qualification_sections:
-                h2 = div.select_one("h2")
-                if h2:
-                    h2_text = clean_text(h2.get_text())
-                    if h2_text and "Qualification" in h2_text:
-                        target_section = div
-                        break
-            
-            # Fallback: search all divs if specific selector didn't work
-            if not target_section:
-                for div in soup.select("div"):
-                    h2 = div.select_one("h2")
-                    if h2 and "Qualification" in h2.get_text():
-                        target_section = div
-                        break
+            target_section = ProfileEnricher._find_section(soup, lambda text: "Qualification" in text)
 
             if target_section:
                 # Find table within this section
-                table = target_section.select_one("table")
+                table = target_section.find("table")
                 if table:
                     # Parse tbody rows, extract institute (td[0]) and degree (td[1])
-                    tbody = table.select_one("tbody")
+                    tbody = table.find("tbody")
                     if tbody:
-                        for tr in tbody.select("tr"):
-                            tds = tr.select("td")
+                        for tr in tbody.find_all("tr"):
+                            tds = tr.find_all("td")
                             if len(tds) >= 2:
                                 institute = clean_text(tds[0].get_text())
                                 degree = clean_text(tds[1].get_text())
@@ -343,14 +379,11 @@ class ProfileEnricher:
         work_history = []
 
         try:
-            # Extract years from intro: look for "X Yrs Experience" pattern
-            for p in soup.select("p"):
-                text = p.get_text()
-                if "Yrs Experience" in text or "Years Experience" in text:
-                    # Extract number from text like "20 Yrs Experience"
-                    digits = "".join(ch for ch in text if ch.isdigit())
-                    if digits:
-                        experience_years = int(digits)
+            # Extract years from intro: the first <p> with an "X Yrs Experience" pattern
+            for p in soup.find_all("p"):
+                match = _EXPERIENCE_YEARS_RE.search(p.get_text())
+                if match:
+                    experience_years = int(match.group(1))
                     break
         except Exception:
             pass
@@ -370,37 +403,17 @@ class ProfileEnricher:
             #     </table>
             # </div>
             
-            # Try specific selector first (more reliable)
-            experience_sections = soup.select("div.bg-marham-light-border.shadow-card, div.col-12.col-md-12")
-            
-            target_section = None
-            for div in experience_sections:
-                h2 = div.select_one("h2")
-                if h2:
-                    h2_text = clean_text(h2.get_text())
-                    if h2_text and "Experience" in h2_text and "Qualification" not in h2_text:
-                        target_section = div
-                        break
-            
-            # Fallback: search all divs if specific selector didn't work
-            if not target_section:
-                for div in soup.select("div"):
-                    h2 = div.select_one("h2")
-                    if h2:
-                        h2_text = clean_text(h2.get_text())
-                        if h2_text and "Experience" in h2_text and "Qualification" not in h2_text:
-                            target_section = div
-                            break
+            target_section = ProfileEnricher._find_section(soup, lambda text: "Experience" in text and "Qualification" not in text)
 
             if target_section:
                 # Find table within this section
-                table = target_section.select_one("table")
+                table = target_section.find("table")
                 if table:
                     # Parse tbody rows, extract institute (td[0]) and designation (td[1])
-                    tbody = table.select_one("tbody")
+                    tbody = table.find("tbody")
                     if tbody:
-                        for tr in tbody.select("tr"):
-                            tds = tr.select("td")
+                        for tr in tbody.find_all("tr"):
+                            tds = tr.find_all("td")
                             if len(tds) >= 2:
                                 institute = clean_text(tds[0].get_text())
                                 designation = clean_text(tds[1].get_text())
@@ -437,35 +450,15 @@ class ProfileEnricher:
         services = []
         try:
             # Find the Services section - look for div containing h2 with "Services"
-            # Try specific selector first (more reliable)
-            service_sections = soup.select("div.bg-marham-light-border.border-card, div.col-12.col-md-12")
-            
-            target_section = None
-            for div in service_sections:
-                h2 = div.select_one("h2")
-                if h2:
-                    h2_text = clean_text(h2.get_text())
-                    if h2_text and "Services" in h2_text:
-                        target_section = div
-                        break
-            
-            # Fallback: search all divs if specific selector didn't work
-            if not target_section:
-                for div in soup.select("div"):
-                    h2 = div.select_one("h2")
-                    if h2:
-                        h2_text = clean_text(h2.get_text())
-                        if h2_text and "Services" in h2_text:
-                            target_section = div
-                            break
+            target_section = ProfileEnricher._find_section(soup, lambda text: "Services" in text)
 
             if target_section:
                 # Find the ul with class "grid-list"
-                services_list = target_section.select_one("ul.grid-list")
+                services_list = _GRID_LIST_SEL.select_one(target_section)
                 if services_list:
                     # Extract service names from anchor tags
-                    for li in services_list.select("li"):
-                        anchor = li.select_one("a.sevice_dr_profile_clicked, a")
+                    for li in services_list.find_all("li"):
+                        anchor = _SERVICE_LINK_SEL.select_one(li)
                         if anchor:
                             # Try data-service attribute first, then text content
                             service_name = anchor.get("data-service") or clean_text(anchor.get_text())
@@ -499,35 +492,15 @@ class ProfileEnricher:
         diseases = []
         try:
             # Find the Diseases section - look for div containing h2 with "Diseases"
-            # Try specific selector first (more reliable)
-            disease_sections = soup.select("div.bg-marham-light-border.border-card, div.col-12.col-md-12")
-            
-            target_section = None
-            for div in disease_sections:
-                h2 = div.select_one("h2")
-                if h2:
-                    h2_text = clean_text(h2.get_text())
-                    if h2_text and "Diseases" in h2_text:
-                        target_section = div
-                        break
-            
-            # Fallback: search all divs if specific selector didn't work
-            if not target_section:
-                for div in soup.select("div"):
-                    h2 = div.select_one("h2")
-                    if h2:
-                        h2_text = clean_text(h2.get_text())
-                        if h2_text and "Diseases" in h2_text:
-                            target_section = div
-                            break
+            target_section = ProfileEnricher._find_section(soup, lambda text: "Diseases" in text)
 
             if target_section:
                 # Find the ul with class "grid-list"
-                diseases_list = target_section.select_one("ul.grid-list")
+                diseases_list = _GRID_LIST_SEL.select_one(target_section)
                 if diseases_list:
                     # Extract disease names from anchor tags
-                    for li in diseases_list.select("li"):
-                        anchor = li.select_one("a.disease_dr_profile_clicked, a")
+                    for li in diseases_list.find_all("li"):
+                        anchor = _DISEASE_LINK_SEL.select_one(li)
                         if anchor:
                             # Try data-disease attribute first, then text content
                             disease_name = anchor.get("data-disease") or clean_text(anchor.get_text())
@@ -559,36 +532,16 @@ class ProfileEnricher:
         symptoms = []
         try:
             # Find the Symptoms section - look for div containing h2 with "Symptoms"
-            # Try specific selector first (more reliable)
-            symptom_sections = soup.select("div.bg-marham-light-border.border-card, div.col-12.col-md-12")
-            
-            target_section = None
-            for div in symptom_sections:
-                h2 = div.select_one("h2")
-                if h2:
-                    h2_text = clean_text(h2.get_text())
-                    if h2_text and "Symptoms" in h2_text:
-                        target_section = div
-                        break
-            
-            # Fallback: search all divs if specific selector didn't work
-            if not target_section:
-                for div in soup.select("div"):
-                    h2 = div.select_one("h2")
-                    if h2:
-                        h2_text = clean_text(h2.get_text())
-                        if h2_text and "Symptoms" in h2_text:
-                            target_section = div
-                            break
+            target_section = ProfileEnricher._find_section(soup, lambda text: "Symptoms" in text)
 
             if target_section:
                 # Find the ul with class "grid-list"
-                symptoms_list = target_section.select_one("ul.grid-list")
+                symptoms_list = _GRID_LIST_SEL.select_one(target_section)
                 if symptoms_list:
                     # Extract symptom names from anchor tags
                     # Note: class "symptom_dr_profile_clicked" is on the <li>, not the <a>
-                    for li in symptoms_list.select("li.symptom_dr_profile_clicked, li"):
-                        anchor = li.select_one("a")
+                    for li in _SYMPTOM_ITEM_SEL.select(symptoms_list):
+                        anchor = li.find("a")
                         if anchor:
                             symptom_name = clean_text(anchor.get_text())
                             if symptom_name and symptom_name not in symptoms:
@@ -631,8 +584,8 @@ class ProfileEnricher:
             statement_section = None
             
             # Try to find section with h2 containing "Professional Statement"
-            for section in soup.select("section"):
-                h2 = section.select_one("h2")
+            for section in soup.find_all("section"):
+                h2 = section.find("h2")
                 if h2 and "Professional Statement" in h2.get_text():
                     statement_section = section
                     break
@@ -646,7 +599,7 @@ class ProfileEnricher:
                 content_div = statement_section.select_one("div.column, div.container")
                 if content_div:
                     # Get all text content, preserving structure
-                    paragraphs = content_div.select("p")
+                    paragraphs = content_div.find_all("p")
                     statement_parts = []
                     for p in paragraphs:
                         text = clean_text(p.get_text())
@@ -2,34 +2,65 @@
 
 from __future__ import annotations
 
-from typing import Optional
-from bs4 import BeautifulSoup
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 
 from scrapers.database.mongo_client import MongoClientManager
 from scrapers.models.doctor_model import DoctorModel
-from scrapers.models.hospital_model import HospitalModel
 from scrapers.utils.url_parser import is_hospital_url, parse_hospital_url
 from scrapers.logger import logger
 
 
 class HospitalPracticeHandler:
-    """Handles upserting hospital practices and managing doctor-hospital relationships."""
+    """Handles upserting hospital practices and managing doctor-hospital relationships.
+
+    Writes are queued per (hospital_url, doctor profile_url) and sent to MongoDB
+    in bulk (hospitals first, then their doctor entries) when `flush()` is called
+    or the queue reaches `flush_threshold` pending pairs. Each hospital is upserted
+    once per flush, and not at all if the same hospital data was already written
+    by an earlier flush.
+    """
 
     PLATFORM = "marham"
+    WRITTEN_HOSPITALS_CACHE_SIZE = 4096  # hospitals whose last written data is remembered
 
-    def __init__(self, mongo_client: MongoClientManager):
+    def __init__(self, mongo_client: MongoClientManager, flush_threshold: int = 200):
         """Initialize with MongoDB client.
-        
+
         Args:
             mongo_client: MongoClientManager instance
+            flush_threshold: Number of queued practices that triggers an automatic flush
         """
         self.mongo_client = mongo_client
+        self.flush_threshold = flush_threshold
+        # (hospital_url, profile_url) -> hospital.doctors operations; re-queuing a pair replaces them
+        self._pending: Dict[Tuple[str, str], List[UpdateOne]] = {}
+        # hospital_url -> hospital fields to upsert (latest practice wins)
+        self._pending_hospitals: Dict[str, dict] = {}
+        # hospital_url -> fields last written successfully (LRU, oldest first)
+        self._written_hospitals: "OrderedDict[str, dict]" = OrderedDict()
 
     def upsert_hospital_practice(self, practice: dict, doctor: DoctorModel) -> None:
         """Ensure hospital doc exists and record this doctor's practice info for that hospital.
 
-        - Upserts hospital basic info using `update_hospital`.
-        - Merges/updates the hospital's `doctors` list with an entry for this doctor (profile_url).
+        Immediate variant of `queue_upsert` + `flush` (also flushes anything already queued).
+
+        Args:
+            practice: Dictionary with hospital practice information
+            doctor: DoctorModel instance
+        """
+        self.queue_upsert(practice, doctor)
+        self.flush()
+
+    def queue_upsert(self, practice: dict, doctor: DoctorModel) -> None:
+        """Queue the hospital upsert and hospital.doctors entry for this practice.
+
+        - Upserts hospital basic info (name, city, area, address, location).
+        - Updates this doctor's entry in the hospital's `doctors` list (fee, timings, name),
+          or appends it if the doctor is not listed yet.
 
         Args:
             practice: Dictionary with hospital practice information
@@ -39,7 +70,7 @@ class HospitalPracticeHandler:
             return
 
         hosp_url = practice.get("hospital_url")
-        
+
         # Only process if it's a real hospital URL
         if not hosp_url or not is_hospital_url(hosp_url):
             return
@@ -53,7 +84,7 @@ class HospitalPracticeHandler:
 
         # Parse city, name, area from URL
         url_parts = parse_hospital_url(hosp_url)
-        
+
         # Build minimal hospital doc to upsert
         hosp_doc = {
             "name": hosp_name or url_parts.get("name") or "",
@@ -68,72 +99,86 @@ class HospitalPracticeHandler:
         if lat is not None and lng is not None:
             hosp_doc["location"] = {"lat": lat, "lng": lng}
 
+        # Doctor entry to upsert into hospital.doctors
+        doctor_entry = {
+            "profile_url": doctor.profile_url,
+            "name": doctor.name,
+            "fee": fee,
+            "timings": timings,
+            "practice_id": practice.get("h_id"),
+        }
+
+        # The two filters are mutually exclusive, so at most one of them applies
+        self._pending_hospitals[hosp_url] = hosp_doc
+        self._pending[(hosp_url, doctor.profile_url)] = [
+            UpdateOne(
+                {"url": hosp_url, "doctors.profile_url": doctor.profile_url},
+                {"$set": {"doctors.$.fee": fee, "doctors.$.timings": timings, "doctors.$.name": doctor.name}},
+            ),
+            UpdateOne(
+                {"url": hosp_url, "doctors.profile_url": {"$ne": doctor.profile_url}},
+                {"$push": {"doctors": doctor_entry}},
+            ),
+        ]
+
+        if len(self._pending) >= self.flush_threshold:
+            self.flush()
+
+    def flush(self) -> int:
+        """Send all queued practice writes in two unordered bulk writes.
+
+        Hospital upserts go first, so doctor entries are pushed into hospitals that
+        exist. Within each write a failing operation does not stop the others: the
+        per-pair doctor operations are idempotent and independent of each other.
+
+        Returns:
+            Number of hospital documents inserted or modified
+        """
+        if not self._pending:
+            return 0
+
+        hospitals = self._pending_hospitals
+        changed = [(url, doc) for url, doc in hospitals.items() if self._written_hospitals.get(url) != doc]
+        doctor_operations = [op for ops in self._pending.values() for op in ops]
+        self._pending = {}
+        self._pending_hospitals = {}
+
+        # Clearing content_hash lets the next Step 2 enrichment rewrite the fields set here
+        written, failed = self._bulk_write(
+            [UpdateOne({"url": url}, {"$set": doc, "$unset": {"content_hash": ""}}, upsert=True) for url, doc in changed],
+            "hospital",
+        )
+        failed_urls = {changed[index][0] for index in failed}
+        for url, doc in hospitals.items():
+            if url not in failed_urls:
+                self._written_hospitals[url] = doc
+                self._written_hospitals.move_to_end(url)
+        while len(self._written_hospitals) > self.WRITTEN_HOSPITALS_CACHE_SIZE:
+            self._written_hospitals.popitem(last=False)
+
+        doctors_written, _ = self._bulk_write(doctor_operations, "hospital doctor")
+        return written + doctors_written
+
+    def _bulk_write(self, operations: List[UpdateOne], kind: str) -> Tuple[int, Set[int]]:
+        """Run an unordered bulk write on the hospitals collection and report failed operations.
+
+        Args:
+            operations: Operations to send
+            kind: What the operations write, for the log message
+
+        Returns:
+            Tuple of (documents inserted or modified, indexes of the operations that failed)
+        """
+        if not operations:
+            return 0, set()
         try:
-            # Upsert hospital (will create if missing)
-            if hasattr(self.mongo_client, "update_hospital"):
-                self.mongo_client.update_hospital(hosp_url, hosp_doc)
-            else:
-                # fallback insert
-                try:
-                    self.mongo_client.insert_hospital(HospitalModel(**hosp_doc).dict())
-                except Exception:
-                    pass
-
-            # Now merge doctor entry into hospital.doctors
-            # Always use URL for lookup (most reliable)
-            hosp_filter = {"url": hosp_url}
-            hosp_record = self.mongo_client.hospitals.find_one(hosp_filter) or {}
-            existing_doctors = hosp_record.get("doctors") or []
-            
-            # If doctors is a list of simple dicts (from Phase 1), convert to full format
-            if existing_doctors and isinstance(existing_doctors[0], dict) and "fee" not in existing_doctors[0]:
-                # Phase 1 format: just name and profile_url
-                # Convert to Phase 2 format with fee and timings
-                pass  # We'll merge below
-
-            # Doctor entry to upsert into hospital.doctors
-            doctor_entry = {
-                "profile_url": doctor.profile_url,
-                "name": doctor.name,
-                "fee": fee,
-                "timings": timings,
-                "practice_id": practice.get("h_id"),
-            }
-
-            updated = False
-            for i, d in enumerate(existing_doctors):
-                if isinstance(d, dict) and d.get("profile_url") == doctor.profile_url:
-                    # merge fields
-                    if d.get("fee") != fee:
-                        d["fee"] = fee
-                        updated = True
-                    if d.get("timings") != timings:
-                        d["timings"] = timings
-                        updated = True
-                    if d.get("name") != doctor.name:
-                        d["name"] = doctor.name
-                        updated = True
-                    existing_doctors[i] = d
-                    break
-            else:
-                # not found, append
-                existing_doctors.append(doctor_entry)
-                updated = True
-
-            # If location present, ensure hospital doc contains it
-            if (lat is not None and lng is not None) and hosp_record.get("location") != {"lat": lat, "lng": lng}:
-                hosp_record["location"] = {"lat": lat, "lng": lng}
-                updated = True
-
-            if updated:
-                # write back doctors and location fields
-                update_fields = {"doctors": existing_doctors}
-                if hosp_record.get("location"):
-                    update_fields["location"] = hosp_record.get("location")
-                try:
-                    self.mongo_client.hospitals.update_one(hosp_filter, {"$set": update_fields}, upsert=True)
-                except Exception:
-                    logger.warning("Failed to update hospital doctors for {}", hosp_name)
+            result = self.mongo_client.hospitals.bulk_write(operations, ordered=False)
+            return result.modified_count + result.upserted_count, set()
+        except BulkWriteError as exc:
+            details = exc.details or {}
+            failed = {error["index"] for error in details.get("writeErrors", [])}
+            logger.warning("{} of {} {} practice operations failed: {}", len(failed), len(operations), kind, exc)
+            return details.get("nModified", 0) + details.get("nUpserted", 0), failed
         except Exception as exc:  # noqa: BLE001
-            logger.debug("Failed to upsert hospital practice {}: {}", practice, exc)
-
+            logger.warning("Failed to bulk upsert {} {} practice operations: {}", len(operations), kind, exc)
+            return 0, set(range(len(operations)))
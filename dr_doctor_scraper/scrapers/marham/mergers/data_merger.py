@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Optional
-from datetime import datetime
+import hashlib
+import json
+import sys
+from typing import Any, Optional
 
 from scrapers.models.doctor_model import DoctorModel
 
@@ -11,76 +13,89 @@ from scrapers.models.doctor_model import DoctorModel
 class DataMerger:
     """Handles merging of existing and new doctor records."""
 
+    # (DoctorModel attribute, ProfileEnricher.parse_doctor_profile key) copied onto the doctor when non-empty
+    PROFILE_FIELDS = (
+        ("specialty", "specialties"),
+        ("pmdc_verified", "pmdc_verified"),
+        ("qualifications", "qualifications"),
+        ("experience_years", "experience_years"),
+        ("work_history", "work_history"),
+        ("services", "services"),
+        ("diseases", "diseases"),
+        ("symptoms", "symptoms"),
+        ("professional_statement", "professional_statement"),
+        ("patients_treated", "patients_treated"),
+        ("reviews_count", "reviews_count"),
+        ("patient_satisfaction_score", "patient_satisfaction_score"),
+        ("phone", "phone"),
+        ("consultation_types", "consultation_types"),
+    )
+
     @staticmethod
-    def merge_doctor_records(existing: dict, new_model: DoctorModel) -> Optional[dict]:
-        """Merge existing doctor document with data from new_model.
+    def content_hash(data: Any) -> str:
+        """Return a stable 128-bit digest of JSON-like data (key order does not matter).
+
+        Args:
+            data: Dicts/lists/scalars to fingerprint, e.g. parsed profile details
 
-        Returns a dict of fields to set (for MongoDB $set) or None if no change.
-        - Preserves existing richer fields when new_model has empty/None values.
-        - Merges `hospitals` lists deduplicating by URL.
+        Returns:
+            Hex digest string
+        """
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def apply_profile_details(doctor: DoctorModel, details: dict) -> None:
+        """Copy non-empty profile fields parsed from a doctor's page onto the model.
 
         Args:
-            existing: Existing doctor document from database
-            new_model: New DoctorModel instance to merge
+            doctor: DoctorModel instance to update in place
+            details: Output of `ProfileEnricher.parse_doctor_profile`
+        """
+        for attr, key in DataMerger.PROFILE_FIELDS:
+            value = details.get(key)
+            if value:
+                setattr(doctor, attr, value)
+
+        # A few hundred specialty names repeat across every doctor; share one string object per name
+        if details.get("specialties"):
+            doctor.specialty = [sys.intern(s) for s in doctor.specialty]
+
+    @staticmethod
+    def build_delta_update(existing: dict, new_data: dict, append_fields: tuple = ("hospitals",)) -> Optional[dict]:
+        """Build a MongoDB update document containing only the fields that changed.
+
+        - Fields equal to the stored value are left out of `$set`.
+        - For `append_fields`, if the new list only appends to the stored list,
+          the new items are sent with `$addToSet` instead of rewriting the array.
+
+        Args:
+            existing: Existing document from database
+            new_data: Full new document (e.g. `DoctorModel.model_dump()`)
+            append_fields: List fields that are normally only appended to
 
         Returns:
-            Dictionary of fields to update, or None if no changes needed
+            Update document (`$set` / `$addToSet`), or None if nothing changed
         """
-        if not existing:
-            return new_model.dict()
-
-        existing_data = {k: v for k, v in existing.items() if k not in ("_id", "scraped_at")}
-        new_data = {k: v for k, v in new_model.dict().items() if k not in ("_id", "scraped_at")}
-
-        updated: dict = {}
-
-        # Merge hospitals (list of dicts with possible fee/timings)
-        existing_hospitals = existing_data.get("hospitals") or []
-        if not isinstance(existing_hospitals, list):
-            existing_hospitals = []
-        new_hospitals = new_data.get("hospitals") or []
-
-        # Build mapping by url (fallback to name if url missing)
-        merged_map = {}
-        for h in existing_hospitals:
-            if isinstance(h, dict):
-                key = h.get("url") or h.get("name")
-                if key:
-                    merged_map[key] = dict(h)
-
-        for h in new_hospitals:
-            if not isinstance(h, dict):
-                continue
-            key = h.get("url") or h.get("name")
-            if not key:
-                continue
-            if key in merged_map:
-                # update fields if new provides non-empty values
-                for fk, fv in h.items():
-                    if fv is None or (isinstance(fv, (list, str)) and len(fv) == 0):
-                        continue
-                    if merged_map[key].get(fk) != fv:
-                        merged_map[key][fk] = fv
-            else:
-                merged_map[key] = dict(h)
-
-        merged_hospitals = list(merged_map.values())
-        if merged_hospitals != existing_hospitals:
-            updated["hospitals"] = merged_hospitals
-
-        # For other fields, prefer non-empty values from new_data; otherwise keep existing
+        set_fields: dict = {}
+        add_to_set: dict = {}
+
         for key, val in new_data.items():
-            if key == "hospitals":
+            if key == "_id":
                 continue
-            if val is None or (isinstance(val, (list, str)) and len(val) == 0):
-                # skip empty new values
+            old = existing.get(key)
+            if old == val:
                 continue
-            if existing_data.get(key) != val:
-                updated[key] = val
-
-        if not updated:
-            return None
-
-        updated["scraped_at"] = datetime.utcnow()
-        return updated
-
+            if key in append_fields and isinstance(old, list) and isinstance(val, list) and val[:len(old)] == old:
+                added = val[len(old):]
+                if added:
+                    add_to_set[key] = {"$each": added}
+                continue
+            set_fields[key] = val
+
+        update: dict = {}
+        if set_fields:
+            update["$set"] = set_fields
+        if add_to_set:
+            update["$addToSet"] = add_to_set
+        return update or None
@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import threading
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional
 from queue import Queue
 
+import requests
+from pymongo import UpdateOne
+
 from scrapers.logger import logger
 from scrapers.marham_scraper import MarhamScraper
 from scrapers.database.mongo_client import MongoClientManager
+from scrapers.utils.rate_limiter import RateLimiter
 
 
 class MultiThreadedMarhamScraper:
@@ -31,6 +34,7 @@ class MultiThreadedMarhamScraper:
         headless: bool = True,
         timeout_ms: int = 15000,
         max_retries: int = 3,
+        requests_per_second: Optional[float] = None,
     ) -> None:
         """Initialize multi-threaded scraper.
         
@@ -40,6 +44,8 @@ class MultiThreadedMarhamScraper:
             headless: Run browsers in headless mode
             timeout_ms: Page load timeout in milliseconds
             max_retries: Maximum retries for failed operations
+            requests_per_second: Listing and profile page loads per second across all
+                threads (default: `MarhamScraper.PAGES_PER_SECOND`, whatever `num_threads` is)
         """
         self.mongo_client = mongo_client
         self.num_threads = num_threads
@@ -47,6 +53,12 @@ class MultiThreadedMarhamScraper:
         self.timeout_ms = timeout_ms
         self.max_retries = max_retries
         
+        # Token buckets shared by every worker, so the site sees the same global rates as a
+        # single-threaded run however many threads there are; budget left unused by an
+        # idle thread can be spent by the others
+        self.rate_limiter = RateLimiter(rate=requests_per_second or MarhamScraper.PAGES_PER_SECOND)
+        self.hospital_limiter = RateLimiter(rate=MarhamScraper.HOSPITALS_PER_SECOND)
+        
         # Thread-safe statistics
         self.stats_lock = threading.Lock()
         self.stats = {
@@ -55,6 +67,7 @@ class MultiThreadedMarhamScraper:
             "skipped": 0,
             "hospitals": 0,
             "updated": 0,
+            "hospitals_unchanged": 0,
             "doctors": 0,
             "errors": 0,
         }
@@ -66,6 +79,20 @@ class MultiThreadedMarhamScraper:
                 if key in self.stats:
                     self.stats[key] += value
     
+    def _new_scraper(self, http_session: Optional[requests.Session] = None) -> MarhamScraper:
+        """Create a per-thread MarhamScraper that paces its requests with the shared limiters."""
+        scraper = MarhamScraper(
+            mongo_client=self.mongo_client,
+            headless=self.headless,
+            timeout_ms=self.timeout_ms,
+            max_retries=self.max_retries,
+            parse_workers=0,  # threads already parallelize; avoid a process pool per thread
+            http_session=http_session,
+        )
+        scraper.page_limiter = self.rate_limiter
+        scraper.hospital_limiter = self.hospital_limiter
+        return scraper
+
     def _step1_worker(self, cities: List[dict], limit: Optional[int], num_threads: int) -> Dict[str, int]:
         """Worker thread for Step 1: Collect hospitals from listing pages for assigned cities.
         
@@ -82,12 +109,7 @@ class MultiThreadedMarhamScraper:
         BASE_URL = "https://www.marham.pk"
         
         try:
-            with MarhamScraper(
-                mongo_client=self.mongo_client,
-                headless=self.headless,
-                timeout_ms=self.timeout_ms,
-                max_retries=self.max_retries,
-            ) as scraper:
+            with self._new_scraper() as scraper:
                 logger.info(f"[Thread {thread_id}] Starting Step 1 worker for {len(cities)} cities")
                 
                 thread_limit = (limit // num_threads) + 1 if limit else None
@@ -118,6 +140,7 @@ class MultiThreadedMarhamScraper:
                         continue
                     
                     page = 1
+                    last_page = 0  # highest page seen in the pagination so far
                     city_collected = 0
                     
                     # Process all pages for this city
@@ -139,9 +162,7 @@ class MultiThreadedMarhamScraper:
                         )
                         
                         try:
-                            scraper.load_page(url)
-                            scraper.wait_for("body")
-                            html = scraper.get_html()
+                            html, locations = scraper._fetch_listing_page(url)
                             # Mark page as success
                             self.mongo_client.mark_page_success(url)
                         except Exception as exc:
@@ -157,7 +178,16 @@ class MultiThreadedMarhamScraper:
                             logger.info(f"[Thread {thread_id}] No more hospitals found on page {page} for city {city_name}")
                             break
                         
+                        # Start loading the following listing pages while this one is processed
+                        # (only needed while listing pages come from the browser)
+                        last_page = max(last_page, scraper.hospital_parser.parse_last_page(html) or 0)
+                        if scraper._http is None:
+                            prefetch_until = min(page + scraper.prefetch_depth, max(last_page, page + 1))
+                            for next_page in range(page + 1, prefetch_until + 1):
+                                scraper.prefetch_page(f"{BASE_URL}/hospitals/{city_slug}?page={next_page}")
+                        
                         # Process hospitals from this page
+                        existing_urls = self.mongo_client.existing_hospital_urls(h.get("url") for h in hospitals)
                         for h in hospitals:
                             if not h.get("name") or not h.get("url"):
                                 continue
@@ -165,21 +195,14 @@ class MultiThreadedMarhamScraper:
                             hospital_url = h.get("url")
                             
                             # Check if hospital already exists
-                            existing = self.mongo_client.hospitals.find_one({"url": hospital_url})
-                            if existing:
+                            if hospital_url in existing_urls:
                                 city_collected += 1
                                 continue
                             
                             # Extract location if possible
-                            if scraper.page:
-                                try:
-                                    location = scraper.hospital_parser.extract_location_from_card(
-                                        scraper.page, hospital_url
-                                    )
-                                    if location:
-                                        h["location"] = location
-                                except Exception:
-                                    pass
+                            location = locations.get(hospital_url)
+                            if location:
+                                h["location"] = location
                             
                             # Save minimal hospital record
                             try:
@@ -195,17 +218,28 @@ class MultiThreadedMarhamScraper:
                                 if h.get("location"):
                                     minimal["location"] = h["location"]
                                 
-                                if self.mongo_client.update_hospital(hospital_url, minimal):
-                                    worker_stats["hospitals"] += 1
-                                    city_collected += 1
-                                    total_collected += 1
-                                    logger.debug(f"[Thread {thread_id}] Collected hospital: {h.get('name')}")
+                                scraper._queue_write(
+                                    scraper._hospital_ops,
+                                    self.mongo_client.hospitals,
+                                    UpdateOne({"url": hospital_url}, {"$setOnInsert": minimal}, upsert=True),
+                                )
+                                worker_stats["hospitals"] += 1
+                                city_collected += 1
+                                total_collected += 1
+                                logger.debug(f"[Thread {thread_id}] Collected hospital: {h.get('name')}")
                             except Exception as exc:
                                 logger.warning(f"[Thread {thread_id}] Failed to save hospital: {exc}")
                                 worker_stats["errors"] += 1
                         
+                        # The pagination links every following page, so none is left past the last one
+                        if last_page and page >= last_page:
+                            logger.info(f"[Thread {thread_id}] Reached last page {page} for city {city_name}")
+                            break
+                        
                         page += 1
-                        time.sleep(0.5)  # Polite pause between pages
+                        scraper.page_limiter.acquire()  # Polite pacing between pages
+                    
+                    scraper._flush_writes(scraper._hospital_ops, self.mongo_client.hospitals)
                     
                     # Mark city as scraped if we collected hospitals
                     if city_collected > 0:
@@ -233,12 +267,7 @@ class MultiThreadedMarhamScraper:
         thread_id = threading.current_thread().ident
         
         try:
-            with MarhamScraper(
-                mongo_client=self.mongo_client,
-                headless=self.headless,
-                timeout_ms=self.timeout_ms,
-                max_retries=self.max_retries,
-            ) as scraper:
+            with self._new_scraper() as scraper:
                 logger.info(f"[Thread {thread_id}] Starting retry worker for {len(pages)} pages")
                 
                 for page_doc in pages:
@@ -255,9 +284,7 @@ class MultiThreadedMarhamScraper:
                     self.mongo_client.mark_page_retrying(url)
                     
                     try:
-                        scraper.load_page(url)
-                        scraper.wait_for("body")
-                        html = scraper.get_html()
+                        html, locations = scraper._fetch_listing_page(url)
                         
                         hospitals = scraper.hospital_parser.parse_hospital_cards(html)
                         if not hospitals:
@@ -267,6 +294,7 @@ class MultiThreadedMarhamScraper:
                         
                         # Process hospitals
                         page_collected = 0
+                        existing_urls = self.mongo_client.existing_hospital_urls(h.get("url") for h in hospitals)
                         for h in hospitals:
                             if not h.get("name") or not h.get("url"):
                                 continue
@@ -274,21 +302,14 @@ class MultiThreadedMarhamScraper:
                             hospital_url = h.get("url")
                             
                             # Check if hospital already exists
-                            existing = self.mongo_client.hospitals.find_one({"url": hospital_url})
-                            if existing:
+                            if hospital_url in existing_urls:
                                 page_collected += 1
                                 continue
                             
                             # Extract location if possible
-                            if scraper.page:
-                                try:
-                                    location = scraper.hospital_parser.extract_location_from_card(
-                                        scraper.page, hospital_url
-                                    )
-                                    if location:
-                                        h["location"] = location
-                                except Exception:
-                                    pass
+                            location = locations.get(hospital_url)
+                            if location:
+                                h["location"] = location
                             
                             # Save minimal hospital record
                             try:
@@ -304,13 +325,19 @@ class MultiThreadedMarhamScraper:
                                 if h.get("location"):
                                     minimal["location"] = h["location"]
                                 
-                                if self.mongo_client.update_hospital(hospital_url, minimal):
-                                    worker_stats["hospitals"] += 1
-                                    page_collected += 1
+                                scraper._queue_write(
+                                    scraper._hospital_ops,
+                                    self.mongo_client.hospitals,
+                                    UpdateOne({"url": hospital_url}, {"$setOnInsert": minimal}, upsert=True),
+                                )
+                                worker_stats["hospitals"] += 1
+                                page_collected += 1
                             except Exception as exc:
                                 logger.warning(f"[Thread {thread_id}] Failed to save hospital: {exc}")
                                 worker_stats["errors"] += 1
                         
+                        scraper._flush_writes(scraper._hospital_ops, self.mongo_client.hospitals)
+                        
                         # Mark page as success
                         self.mongo_client.mark_page_success(url)
                         logger.info(f"[Thread {thread_id}] Successfully retried page: {url} ({page_collected} hospitals)")
@@ -320,7 +347,7 @@ class MultiThreadedMarhamScraper:
                         self.mongo_client.mark_page_failed(url, str(exc))
                         worker_stats["errors"] += 1
                     
-                    time.sleep(0.5)  # Polite pause
+                    scraper.page_limiter.acquire()  # Polite pacing
                 
                 logger.info(f"[Thread {thread_id}] Retry worker completed: {worker_stats['hospitals']} hospitals")
                 
@@ -339,67 +366,69 @@ class MultiThreadedMarhamScraper:
         Returns:
             Statistics dictionary
         """
-        worker_stats = {"hospitals": 0, "doctors": 0, "errors": 0}
+        worker_stats = {"hospitals": 0, "hospitals_unchanged": 0, "doctors": 0, "errors": 0}
         thread_id = threading.current_thread().ident
         
         try:
-            with MarhamScraper(
-                mongo_client=self.mongo_client,
-                headless=self.headless,
-                timeout_ms=self.timeout_ms,
-                max_retries=self.max_retries,
-            ) as scraper:
+            with self._new_scraper() as scraper:
                 logger.info(f"[Thread {thread_id}] Starting Step 2 worker for {len(hospital_urls)} hospitals")
                 
                 for hospital_url in hospital_urls:
+                    scraper.hospital_limiter.acquire()  # Polite pacing (shared across threads)
                     try:
-                        # Load and enrich hospital
-                        scraper.load_page(hospital_url)
-                        scraper.wait_for("body")
-                        html = scraper.get_html()
+                        # Load and enrich hospital (over HTTP unless the page needs the browser)
+                        html = scraper._fetch_static_html(hospital_url, scraper.doctor_collector.is_rendered_hospital)
+                        in_browser = html is None or scraper.doctor_collector.has_load_more(html)
+                        if in_browser:
+                            scraper.load_page(hospital_url)
+                            scraper.wait_for("body")
+                            html = scraper.get_html()
                         
-                        enriched = scraper.hospital_parser.parse_full_hospital(html, hospital_url)
-                        enriched["url"] = hospital_url
+                        enriched, doctors_from_about = scraper.hospital_parser.parse_hospital_page(html, hospital_url)
+                        scraper._stamp_hospital_hash(enriched, hospital_url)
                         enriched["scrape_status"] = "enriched"
                         
                         # Collect doctors from hospital page
-                        doctor_cards = scraper.doctor_collector.collect_doctor_cards_from_hospital(
-                            scraper, hospital_url
-                        )
+                        if in_browser:
+                            doctor_cards = scraper.doctor_collector.collect_doctor_cards_from_hospital(
+                                scraper, hospital_url, html
+                            )
+                        else:
+                            doctor_cards = scraper.doctor_collector.parse_doctor_cards(html)
                         
-                        doctor_urls = []
+                        # Doctors keyed by profile_url, so one found on a card and in the
+                        # About section is only saved once
+                        hospital_doctors: Dict[str, dict] = {}
                         for card in doctor_cards:
                             doctor = scraper.doctor_parser.parse_doctor_card(card, hospital_url)
                             if doctor and doctor.profile_url:
-                                doctor_urls.append(doctor.profile_url)
-                                
-                                # Insert minimal doctor record
-                                if self.mongo_client.upsert_minimal_doctor(
-                                    profile_url=doctor.profile_url,
-                                    name=doctor.name or "",
-                                    hospital_url=hospital_url
-                                ):
-                                    worker_stats["doctors"] += 1
+                                hospital_doctors.setdefault(
+                                    doctor.profile_url, {"profile_url": doctor.profile_url, "name": doctor.name or ""}
+                                )
                         
-                        # Also extract doctors from About section
-                        doctors_from_about = scraper.doctor_parser.extract_doctors_from_list(html, hospital_url)
+                        # Also add doctors from About section
                         for doc_info in doctors_from_about:
                             if doc_info.get("profile_url"):
-                                if self.mongo_client.upsert_minimal_doctor(
-                                    profile_url=doc_info["profile_url"],
-                                    name=doc_info.get("name", ""),
-                                    hospital_url=hospital_url
-                                ):
-                                    worker_stats["doctors"] += 1
+                                hospital_doctors.setdefault(
+                                    doc_info["profile_url"],
+                                    {"profile_url": doc_info["profile_url"], "name": doc_info.get("name", "")},
+                                )
+                        
+                        # Insert minimal doctor records (one lookup + one bulk write)
+                        self.mongo_client.upsert_minimal_doctors(list(hospital_doctors.values()))
+                        worker_stats["doctors"] += len(hospital_doctors)
                         
-                        # Update hospital in database
+                        # Update hospital in database (the status goes with changed content;
+                        # an unchanged hospital only gets its status written)
                         enriched["scrape_status"] = "doctors_collected"
                         
                         if self.mongo_client.update_hospital(hospital_url, enriched):
-                            self.mongo_client.update_hospital_status(hospital_url, "doctors_collected")
                             worker_stats["hospitals"] += 1
+                        else:
+                            worker_stats["hospitals_unchanged"] += 1
+                            self.mongo_client.update_hospital_status(hospital_url, "doctors_collected")
                         
-                        logger.debug(f"[Thread {thread_id}] Enriched hospital: {enriched.get('name')} ({len(doctor_urls)} doctors)")
+                        logger.debug(f"[Thread {thread_id}] Enriched hospital: {enriched.get('name')} ({len(hospital_doctors)} doctors)")
                         
                     except Exception as exc:
                         logger.error(f"[Thread {thread_id}] Error processing hospital {hospital_url}: {exc}")
@@ -414,11 +443,12 @@ class MultiThreadedMarhamScraper:
         
         return worker_stats
     
-    def _step3_worker(self, doctor_urls: List[str]) -> Dict[str, int]:
+    def _step3_worker(self, doctor_urls: List[str], http_session: requests.Session) -> Dict[str, int]:
         """Worker thread for Step 3: Process doctor profiles.
         
         Args:
             doctor_urls: List of doctor profile URLs to process
+            http_session: HTTP session shared by all Step 3 workers
             
         Returns:
             Statistics dictionary
@@ -427,134 +457,52 @@ class MultiThreadedMarhamScraper:
         thread_id = threading.current_thread().ident
         
         try:
-            with MarhamScraper(
-                mongo_client=self.mongo_client,
-                headless=self.headless,
-                timeout_ms=self.timeout_ms,
-                max_retries=self.max_retries,
-            ) as scraper:
+            with self._new_scraper(http_session) as scraper:
                 logger.info(f"[Thread {thread_id}] Starting Step 3 worker for {len(doctor_urls)} doctors")
                 
-                for doctor_url in doctor_urls:
-                    try:
-                        # Get minimal doctor record from database
-                        doctor_doc = self.mongo_client.doctors.find_one({"profile_url": doctor_url})
-                        if not doctor_doc:
-                            logger.warning(f"[Thread {thread_id}] Doctor not found in DB: {doctor_url}")
-                            continue
-                        
-                        # Filter out MongoDB _id field
-                        doctor_doc = {k: v for k, v in doctor_doc.items() if k != "_id"}
-                        
-                        # Create doctor model
-                        from scrapers.models.doctor_model import DoctorModel
-                        doctor = DoctorModel(**doctor_doc)
+                # Doctor records and hospital affiliations are read for a whole batch at once
+                batch_size = MarhamScraper.AFFILIATION_BATCH_SIZE
+                for batch_start in range(0, len(doctor_urls), batch_size):
+                    batch = doctor_urls[batch_start:batch_start + batch_size]
+                    doctor_docs = {
+                        d["profile_url"]: d
+                        for d in self.mongo_client.doctors.find({"profile_url": {"$in": batch}})
+                    }
+                    batch_affiliations = self.mongo_client.get_hospital_affiliations(batch)
+                    
+                    for doctor_url in batch:
+                        scraper.page_limiter.acquire()  # Polite pacing (shared across threads)
+                        try:
+                            doctor_doc = doctor_docs.get(doctor_url)
+                            if not doctor_doc:
+                                logger.warning(f"[Thread {thread_id}] Doctor not found in DB: {doctor_url}")
+                                continue
                         
-                        # Load and enrich doctor profile
-                        scraper.load_page(doctor_url)
-                        scraper.wait_for("body")
-                        html = scraper.get_html()
-                        details = scraper.profile_enricher.parse_doctor_profile(html)
+                            # Fetch (HTTP when possible, browser otherwise) and enrich doctor profile
+                            html = scraper._fetch_profile_html(doctor_url)
+                            details = scraper.profile_enricher.parse_doctor_profile(html)
                         
-                        # Update doctor with enriched data
-                        if details.get("specialties"):
-                            doctor.specialty = details.get("specialties")
-                        if details.get("qualifications"):
-                            doctor.qualifications = details.get("qualifications")
-                        if details.get("experience_years"):
-                            doctor.experience_years = details.get("experience_years")
-                        if details.get("work_history"):
-                            doctor.work_history = details.get("work_history")
-                        if details.get("services"):
-                            doctor.services = details.get("services")
-                        if details.get("diseases"):
-                            doctor.diseases = details.get("diseases")
-                        if details.get("symptoms"):
-                            doctor.symptoms = details.get("symptoms")
-                        if details.get("professional_statement"):
-                            doctor.professional_statement = details.get("professional_statement")
-                        if details.get("patients_treated"):
-                            doctor.patients_treated = details.get("patients_treated")
-                        if details.get("reviews_count"):
-                            doctor.reviews_count = details.get("reviews_count")
-                        if details.get("patient_satisfaction_score"):
-                            doctor.patient_satisfaction_score = details.get("patient_satisfaction_score")
-                        if details.get("phone"):
-                            doctor.phone = details.get("phone")
-                        if details.get("consultation_types"):
-                            doctor.consultation_types = details.get("consultation_types")
+                            # Same merge as single-threaded Step 3 (practices, affiliations, changed fields)
+                            affiliations = batch_affiliations.get(doctor_url, [])
+                            # Practice upserts stay queued across doctors; flushed in bulk (and on scraper exit)
+                            _, update = scraper._build_doctor_update(doctor_doc, details, affiliations)
                         
-                        # Process practices
-                        for practice in details.get("practices", []):
-                            from scrapers.utils.url_parser import is_hospital_url
-                            practice_url = practice.get("hospital_url")
-                            is_private = practice.get("is_private_practice", False)
-                            
-                            if is_private or not is_hospital_url(practice_url):
-                                if not doctor.private_practice:
-                                    doctor.private_practice = {
-                                        "name": practice.get("hospital_name") or f"{doctor.name}'s Private Practice",
-                                        "url": practice_url,
-                                        "fee": practice.get("fee"),
-                                        "timings": practice.get("timings"),
-                                    }
-                            else:
-                                if not doctor.hospitals:
-                                    doctor.hospitals = []
-                                
-                                hosp_entry = {
-                                    "name": practice.get("hospital_name"),
-                                    "url": practice_url,
-                                    "fee": practice.get("fee"),
-                                    "timings": practice.get("timings"),
-                                    "practice_id": practice.get("h_id"),
-                                }
-                                
-                                existing_urls = {h.get("url") for h in doctor.hospitals if isinstance(h, dict) and h.get("url")}
-                                if practice_url and practice_url not in existing_urls:
-                                    doctor.hospitals.append(hosp_entry)
-                                
-                                scraper.practice_handler.upsert_hospital_practice(practice, doctor)
-                        
-                        # Update doctor in database
-                        doctor.scrape_status = "processed"
-                        
-                        # Use the existing doctor_doc we already fetched (line 257)
-                        # If it exists, merge and update; otherwise insert
-                        if doctor_doc:
-                            # Doctor exists - merge and update
-                            merged = scraper.data_merger.merge_doctor_records(doctor_doc, doctor)
-                            if merged:
-                                result = self.mongo_client.doctors.update_one(
-                                    {"profile_url": doctor.profile_url},
-                                    {"$set": merged}
+                            if update:
+                                scraper._queue_write(
+                                    scraper._doctor_ops,
+                                    self.mongo_client.doctors,
+                                    scraper._doctor_update_op(doctor_url, update),
                                 )
-                                if result.modified_count > 0:
-                                    worker_stats["updated"] += 1
-                                else:
-                                    # Update didn't change anything (shouldn't happen, but handle it)
-                                    worker_stats["skipped"] += 1
-                                worker_stats["doctors"] += 1
+                                worker_stats["updated"] += 1
                             else:
-                                # No changes needed - merge returned None
+                                # No changes needed
                                 worker_stats["skipped"] += 1
-                                worker_stats["doctors"] += 1
-                        else:
-                            # Doctor doesn't exist - insert it
-                            # (This shouldn't happen since we skip if not found, but handle it anyway)
-                            if self.mongo_client.insert_doctor(doctor.dict()):
-                                worker_stats["inserted"] += 1
-                                worker_stats["doctors"] += 1
-                            else:
-                                worker_stats["errors"] += 1
-                        
-                        # Update status regardless of whether we updated or skipped
-                        self.mongo_client.update_doctor_status(doctor.profile_url, "processed")
+                            worker_stats["doctors"] += 1
                         
-                    except Exception as exc:
-                        logger.error(f"[Thread {thread_id}] Error processing doctor {doctor_url}: {exc}")
-                        worker_stats["errors"] += 1
-                        continue
+                        except Exception as exc:
+                            logger.error(f"[Thread {thread_id}] Error processing doctor {doctor_url}: {exc}")
+                            worker_stats["errors"] += 1
+                            continue
                 
                 logger.info(f"[Thread {thread_id}] Step 3 worker completed: {worker_stats['doctors']} doctors")
                 
@@ -700,7 +648,7 @@ class MultiThreadedMarhamScraper:
         # Step 2: Enrich hospitals and collect doctors (parallel)
         if step is None or step == 2:
             logger.info("Step 2: Enriching hospitals and collecting doctors...")
-            hospitals = list(self.mongo_client.get_hospitals_needing_enrichment(limit=limit))
+            hospitals = list(self.mongo_client.get_hospitals_needing_enrichment(limit=limit, projection={"url": 1}))
             hospital_urls = [h["url"] for h in hospitals if h.get("url")]
             
             logger.info(f"Found {len(hospital_urls)} hospitals needing enrichment")
@@ -718,12 +666,14 @@ class MultiThreadedMarhamScraper:
                             logger.error(f"Step 2 worker failed: {exc}")
                             self._update_stats({"errors": 1})
             
-            logger.info(f"Step 2 complete: {self.stats['hospitals']} hospitals enriched, {self.stats['doctors']} doctors collected")
+            logger.info(f"Step 2 complete: {self.stats['hospitals']} hospitals enriched ({self.stats['hospitals_unchanged']} unchanged), {self.stats['doctors']} doctors collected")
         
         # Step 3: Process doctors (parallel)
         if step is None or step == 3:
             logger.info("Step 3: Processing doctor profiles...")
-            doctors = list(self.mongo_client.get_doctors_needing_processing(limit=None))
+            doctors = list(self.mongo_client.get_doctors_needing_processing(
+                limit=None, projection={"profile_url": 1}, fresh_within=MarhamScraper.DOCTOR_TTL
+            ))
             doctor_urls = [d["profile_url"] for d in doctors if d.get("profile_url")]
             
             logger.info(f"Found {len(doctor_urls)} doctors needing processing")
@@ -731,8 +681,10 @@ class MultiThreadedMarhamScraper:
             if doctor_urls:
                 url_chunks = self._distribute_work(doctor_urls, self.num_threads)
                 
-                with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
-                    futures = [executor.submit(self._step3_worker, chunk) for chunk in url_chunks if chunk]
+                # One keep-alive pool for all workers: connections stay warm across threads
+                http_session = MarhamScraper.new_http_session(pool_size=self.num_threads)
+                with http_session, ThreadPoolExecutor(max_workers=self.num_threads) as executor:
+                    futures = [executor.submit(self._step3_worker, chunk, http_session) for chunk in url_chunks if chunk]
                     for future in as_completed(futures):
                         try:
                             stats = future.result()
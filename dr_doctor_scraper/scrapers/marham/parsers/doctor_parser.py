@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
-from bs4 import BeautifulSoup
+from typing import List, Optional, Union
+from urllib.parse import urljoin
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
 
 from scrapers.models.doctor_model import DoctorModel
-from scrapers.utils.parser_helpers import clean_text
+from scrapers.utils.parser_helpers import clean_text, make_soup
 
 BASE_URL = "https://www.marham.pk"
 
+# Selectors run once per doctor card, compiled once at import
+_NAME_SEL = sv.compile("a.dr_profile_opened_from_hospital_profile h3, h3")
+_SPECIALTY_SEL = sv.compile("p.mb-0.text-sm")
+_QUALIFICATIONS_SEL = sv.compile("p.text-sm:not(.mb-0)")
+_EXPERIENCE_SEL = sv.compile(".row .col-4:nth-child(2) p.text-bold.text-sm")
+_ABOUT_DOCTOR_LINKS_SEL = sv.compile("div.row.justify-content-center ul li a")
+
+# The About-section doctor list sits inside div.justify-content-center; skip building the rest of the page
+_ABOUT_LIST_STRAINER = SoupStrainer("div", class_="justify-content-center")
+
 
 class DoctorParser:
     """Parser for extracting doctor data from Marham HTML."""
@@ -28,27 +40,29 @@ class DoctorParser:
             DoctorModel instance or None if parsing fails
         """
         try:
-            name_tag = card.select_one("a.dr_profile_opened_from_hospital_profile h3, h3")
+            name_tag = _NAME_SEL.select_one(card)
             name = clean_text(name_tag.get_text()) if name_tag else None
 
             parent_a = name_tag.parent if name_tag else None
             profile_href = parent_a.get("href") if parent_a and parent_a.has_attr("href") else None
-            profile_url = f"{BASE_URL}{profile_href}" if profile_href and profile_href.startswith("/") else profile_href
+            profile_url = urljoin(BASE_URL, profile_href) if profile_href else None
+            # Cards without a name or profile link are dropped; skip the remaining selectors
+            if not name or not profile_url:
+                return None
 
-            specialty_tag = card.select_one("p.mb-0.text-sm")
-            specialty = [clean_text(specialty_tag.get_text())] if specialty_tag and clean_text(specialty_tag.get_text()) else []
+            specialty_tag = _SPECIALTY_SEL.select_one(card)
+            specialty_text = clean_text(specialty_tag.get_text()) if specialty_tag else None
+            specialty = [specialty_text] if specialty_text else []
 
-            qualifications_tag = card.select_one('p.text-sm:not(.mb-0)')
+            qualifications_tag = _QUALIFICATIONS_SEL.select_one(card)
             qualifications = clean_text(qualifications_tag.get_text()) if qualifications_tag else None
 
-            experience_tag = card.select_one('.row .col-4:nth-child(2) p.text-bold.text-sm')
+            experience_tag = _EXPERIENCE_SEL.select_one(card)
             experience = clean_text(experience_tag.get_text()) if experience_tag else None
 
-            if not name or not profile_url:
-                return None
-
-            # Create a minimal doctor model; hospital affiliations are set later
-            model = DoctorModel(
+            # Create a minimal doctor model; hospital affiliations are set later.
+            # Fields are already cleaned above, so the validators are skipped
+            model = DoctorModel.model_construct(
                 name=name,
                 specialty=specialty,
                 fees=None,
@@ -68,29 +82,30 @@ class DoctorParser:
             return None
 
     @staticmethod
-    def extract_doctors_from_list(html: str, hospital_url: str) -> List[dict]:
+    def extract_doctors_from_list(html: Union[str, BeautifulSoup], hospital_url: str) -> List[dict]:
         """Extract doctor names and URLs from the doctor list in the 'About' section.
         
         Format: <ul><li><a href="...">Dr. Name</a></li></ul>
         
         Args:
-            html: HTML content of the hospital page
+            html: HTML content of the hospital page, or a soup of it the caller
+                already built (it is then not parsed again)
             hospital_url: URL of the hospital page
             
         Returns:
             List of dicts with keys: name, profile_url, hospital_url
         """
-        soup = BeautifulSoup(html, "html.parser")
+        soup = html if isinstance(html, BeautifulSoup) else make_soup(html, parse_only=_ABOUT_LIST_STRAINER)
         doctors_from_list = []
         
         # Look for doctor list links in the About section
-        doctor_list_links = soup.select("div.row.justify-content-center ul li a")
+        doctor_list_links = _ABOUT_DOCTOR_LINKS_SEL.select(soup)
         for link in doctor_list_links:
             doctor_name = clean_text(link.get_text())
             doctor_href = link.get("href")
             
             if doctor_name and doctor_href:
-                profile_url = f"{BASE_URL}{doctor_href}" if doctor_href.startswith("/") else doctor_href
+                profile_url = urljoin(BASE_URL, doctor_href)
                 
                 # Filter out hospital URLs - only include doctor profile URLs
                 if "/hospitals/" not in profile_url and "/doctors/" in profile_url:
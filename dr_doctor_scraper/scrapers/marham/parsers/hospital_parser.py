@@ -3,16 +3,62 @@
 from __future__ import annotations
 
 import re
-import time
-from typing import List, Optional, Dict
-from bs4 import BeautifulSoup
+from typing import List, Optional, Dict, Tuple, Union
+from urllib.parse import urljoin
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
 from playwright.sync_api import Page
 
-from scrapers.utils.parser_helpers import clean_text
+from scrapers.marham.parsers.doctor_parser import DoctorParser
+from scrapers.utils.parser_helpers import clean_text, make_soup
 from scrapers.utils.url_parser import parse_hospital_url
 
 BASE_URL = "https://www.marham.pk"
 
+# Listing-card selectors, compiled once at import (run for every card on every page)
+_CARD_SEL = sv.compile(".row.shadow-card")
+# Listing pages are parsed only as far as the cards; the rest of the page is never built
+_CARD_STRAINER = SoupStrainer(class_="shadow-card")
+_CARD_NAME_SEL = sv.compile(".hosp_list_selected_hosp_name")
+_CARD_TEXT_SEL = sv.compile("p.text-sm")
+_CARD_COORDS_SEL = sv.compile("[data-lat], [data-latitude]")
+_CARD_MAPS_SEL = sv.compile(
+    'iframe[src*="maps"], iframe[src*="google"], a[href*="maps.google"], a[href*="google.com/maps"]'
+)
+# Present in listing HTML only when the server rendered the hospital cards
+_RENDERED_LISTING_MARKER = "hosp_list_selected_hosp_name"
+
+# Hospital detail-page selectors
+_NAME_SEL = sv.compile(".hospital-title, h1, .hosp_name")
+_ADDRESS_SEL = sv.compile(".address, .hospital-address, p.text-sm")
+_CITY_SEL = sv.compile(".city")
+_AREA_SEL = sv.compile(".area")
+_TIMING_SEL = sv.compile(".timing, .hospital-timing")
+_SPECIALTY_LINK_SEL = sv.compile("a.hosp_prof_selected_speciality")
+_ABOUT_SECTION_SEL = sv.compile("div.row.justify-content-center, div.col-12.col-md-8")
+
+# Pagination links on listing pages: ?page=N (also &page=N / &amp;page=N)
+_PAGE_PARAM_RE = re.compile(r'[?&;]page=(\d+)')
+
+# Coordinates in Google Maps URLs: ?q=lat,lng or /@lat,lng
+_MAPS_COORDS_RE = re.compile(r'[?&]q=([\d.-]+),([\d.-]+)|/@([\d.-]+),([\d.-]+)')
+
+# Collects every location hint from all listing cards in a single round trip
+_CARD_LOCATIONS_JS = """
+() => Array.from(document.querySelectorAll('.row.shadow-card')).map(card => {
+    const link = card.querySelector('.hosp_list_selected_hosp_name');
+    const dataEl = card.querySelector('[data-lat], [data-latitude]');
+    return {
+        href: link ? link.getAttribute('href') : null,
+        lat: dataEl ? (dataEl.getAttribute('data-lat') || dataEl.getAttribute('data-latitude')) : null,
+        lng: dataEl ? (dataEl.getAttribute('data-lng') || dataEl.getAttribute('data-longitude')) : null,
+        maps: Array.from(card.querySelectorAll(
+            'iframe[src*="maps"], iframe[src*="google"], a[href*="maps.google"], a[href*="google.com/maps"]'
+        )).map(el => el.getAttribute('src') || el.getAttribute('href') || ''),
+    };
+})
+"""
+
 
 class HospitalParser:
     """Parser for extracting hospital data from Marham HTML."""
@@ -29,20 +75,20 @@ class HospitalParser:
         Returns:
             List of hospital dictionaries with name, city, area, address, url
         """
-        soup = BeautifulSoup(html, "html.parser")
-        cards = soup.select(".row.shadow-card")
+        soup = make_soup(html, parse_only=_CARD_STRAINER)
+        cards = _CARD_SEL.select(soup)
         hospitals: List[dict] = []
 
         for card in cards:
             # Extract name and URL from the main hospital link
-            name_tag = card.select_one(".hosp_list_selected_hosp_name")
+            name_tag = _CARD_NAME_SEL.select_one(card)
             if not name_tag:
                 continue
 
             # Full text includes city at end (e.g., "Hashmanis Hospital - M A Jinnah Road, Karachi")
             full_name = clean_text(name_tag.get_text())
             href = name_tag.get("href") if name_tag.has_attr("href") else None
-            url = href if href and href.startswith("http") else f"{BASE_URL}{href}" if href else None
+            url = urljoin(BASE_URL, href) if href else None
 
             if not url or not full_name:
                 continue
@@ -53,7 +99,7 @@ class HospitalParser:
             city = clean_text(parts[1]) if len(parts) > 1 else "Karachi"
 
             # Extract address: look for p.text-sm elements (skip the empty one)
-            address_paragraphs = card.select("p.text-sm")
+            address_paragraphs = _CARD_TEXT_SEL.select(card)
             address = None
             for p in address_paragraphs:
                 text = clean_text(p.get_text())
@@ -85,6 +131,110 @@ class HospitalParser:
 
         return hospitals
 
+    @staticmethod
+    def is_rendered_listing(html: str) -> bool:
+        """Return True if listing page HTML already contains hospital cards.
+
+        Args:
+            html: Listing page HTML (e.g. from a plain HTTP request)
+
+        Returns:
+            True if the hospital cards are server-rendered
+        """
+        return _RENDERED_LISTING_MARKER in html
+
+    @staticmethod
+    def parse_last_page(html: str) -> Optional[int]:
+        """Return the highest page number linked from a listing page's pagination.
+
+        Args:
+            html: HTML content of a hospital listing page
+
+        Returns:
+            Highest `page=N` found in the page's links, or None if there is no pagination
+        """
+        pages = [int(n) for n in _PAGE_PARAM_RE.findall(html)]
+        return max(pages) if pages else None
+
+    @staticmethod
+    def extract_all_locations(page: Page) -> Dict[str, Dict[str, float]]:
+        """Extract locations for every hospital card on the current listing page.
+
+        Reads all cards with one `page.evaluate` call instead of clicking
+        "View Directions" per card; only cards exposing coordinates in their
+        markup (data attributes or map links) are returned.
+
+        Args:
+            page: Playwright Page object showing a hospital listing page
+
+        Returns:
+            Mapping of hospital URL to a dictionary with 'lat' and 'lng' keys
+        """
+        try:
+            cards = page.evaluate(_CARD_LOCATIONS_JS)
+        except Exception as exc:  # noqa: BLE001
+            from scrapers.logger import logger
+            logger.debug("Failed to extract locations from listing page: {}", exc)
+            return {}
+
+        return HospitalParser._locations_from_cards(cards or [])
+
+    @staticmethod
+    def parse_card_locations(html: str) -> Dict[str, Dict[str, float]]:
+        """Extract locations for every hospital card from listing page HTML.
+
+        Static counterpart of `extract_all_locations` for pages fetched without
+        the browser; reads the same data attributes and map links.
+
+        Args:
+            html: HTML content of a hospital listing page
+
+        Returns:
+            Mapping of hospital URL to a dictionary with 'lat' and 'lng' keys
+        """
+        soup = make_soup(html, parse_only=_CARD_STRAINER)
+        cards = []
+        for card in _CARD_SEL.select(soup):
+            link = _CARD_NAME_SEL.select_one(card)
+            data_el = _CARD_COORDS_SEL.select_one(card)
+            cards.append({
+                "href": link.get("href") if link else None,
+                "lat": (data_el.get("data-lat") or data_el.get("data-latitude")) if data_el else None,
+                "lng": (data_el.get("data-lng") or data_el.get("data-longitude")) if data_el else None,
+                "maps": [el.get("src") or el.get("href") or "" for el in _CARD_MAPS_SEL.select(card)],
+            })
+        return HospitalParser._locations_from_cards(cards)
+
+    @staticmethod
+    def _locations_from_cards(cards: List[dict]) -> Dict[str, Dict[str, float]]:
+        """Turn per-card location hints (`href`, `lat`, `lng`, `maps`) into hospital locations."""
+        locations: Dict[str, Dict[str, float]] = {}
+        for card in cards:
+            href = card.get("href")
+            if not href:
+                continue
+            url = urljoin(BASE_URL, href)
+
+            try:
+                if card.get("lat") and card.get("lng"):
+                    locations[url] = {"lat": float(card["lat"]), "lng": float(card["lng"])}
+                    continue
+            except (ValueError, TypeError):
+                pass
+
+            for maps_url in card.get("maps") or []:
+                coords_match = _MAPS_COORDS_RE.search(maps_url)
+                if coords_match:
+                    try:
+                        lat = float(coords_match.group(1) or coords_match.group(3))
+                        lng = float(coords_match.group(2) or coords_match.group(4))
+                    except (ValueError, TypeError):
+                        continue
+                    locations[url] = {"lat": lat, "lng": lng}
+                    break
+
+        return locations
+
     @staticmethod
     def extract_location_from_card(page: Page, hospital_url: str) -> Optional[Dict[str, float]]:
         """Extract location (lat/lng) by clicking "View Directions" button on a hospital card.
@@ -129,11 +279,9 @@ class HospitalParser:
             
             # Click the button and wait for content to load
             directions_button.click()
-            # Wait a bit for any dynamic content to load
-            time.sleep(1.5)
-            # Try to wait for map or location-related elements to appear
+            # Wait for map or location-related elements to appear (returns as soon as they do)
             try:
-                page.wait_for_selector('iframe[src*="maps"], iframe[src*="google"], [data-lat], a[href*="maps.google"]', timeout=2000)
+                page.wait_for_selector('iframe[src*="maps"], iframe[src*="google"], [data-lat], a[href*="maps.google"]', timeout=3500)
             except Exception:
                 pass  # Continue even if selector doesn't appear
             
@@ -143,7 +291,7 @@ class HospitalParser:
             if iframe:
                 iframe_src = iframe.get_attribute("src") or ""
                 # Extract coordinates from Google Maps URL: ?q=lat,lng or /@lat,lng
-                coords_match = re.search(r'[?&]q=([\d.-]+),([\d.-]+)|/@([\d.-]+),([\d.-]+)', iframe_src)
+                coords_match = _MAPS_COORDS_RE.search(iframe_src)
                 if coords_match:
                     lat = float(coords_match.group(1) or coords_match.group(3))
                     lng = float(coords_match.group(2) or coords_match.group(4))
@@ -178,7 +326,7 @@ class HospitalParser:
             map_link = card.query_selector('a[href*="maps.google"], a[href*="google.com/maps"]')
             if map_link:
                 href = map_link.get_attribute("href") or ""
-                coords_match = re.search(r'[?&]q=([\d.-]+),([\d.-]+)|/@([\d.-]+),([\d.-]+)', href)
+                coords_match = _MAPS_COORDS_RE.search(href)
                 if coords_match:
                     lat = float(coords_match.group(1) or coords_match.group(3))
                     lng = float(coords_match.group(2) or coords_match.group(4))
@@ -192,17 +340,34 @@ class HospitalParser:
             return None
 
     @staticmethod
-    def parse_full_hospital(html: str, url: str) -> dict:
+    def parse_hospital_page(html: str, url: str) -> Tuple[dict, List[dict]]:
+        """Parse a hospital detail page and its About-section doctor list from a single tree.
+
+        Equivalent to `parse_full_hospital` plus `DoctorParser.extract_doctors_from_list`,
+        without building the page twice.
+
+        Args:
+            html: HTML content of the hospital detail page
+            url: URL of the hospital page
+
+        Returns:
+            Tuple of (enriched hospital data, About-section doctors)
+        """
+        soup = make_soup(html)
+        return HospitalParser.parse_full_hospital(soup, url), DoctorParser.extract_doctors_from_list(soup, url)
+
+    @staticmethod
+    def parse_full_hospital(html: Union[str, BeautifulSoup], url: str) -> dict:
         """Parse hospital page to extract enriched hospital information.
         
         Args:
-            html: HTML content of the hospital detail page
+            html: HTML content of the hospital detail page, or a soup of it
             url: URL of the hospital page (format: marham.pk/hospitals/(city)/(name)/(area))
             
         Returns:
             Dictionary with enriched hospital data including specialties, timing, about text
         """
-        soup = BeautifulSoup(html, "html.parser")
+        soup = html if isinstance(html, BeautifulSoup) else make_soup(html)
         
         def _first(el):
             return el.get_text(strip=True) if el else None
@@ -210,15 +375,15 @@ class HospitalParser:
         # Extract city, name, area from URL first (most reliable)
         url_parts = parse_hospital_url(url)
         
-        name = clean_text(_first(soup.select_one(".hospital-title, h1, .hosp_name"))) or url_parts.get("name")
-        address = clean_text(_first(soup.select_one(".address, .hospital-address, p.text-sm")))
-        city = url_parts.get("city") or clean_text(_first(soup.select_one(".city"))) or "Karachi"
-        area = url_parts.get("area") or clean_text(_first(soup.select_one(".area")))
-        timing = clean_text(_first(soup.select_one(".timing, .hospital-timing")))
+        name = clean_text(_first(_NAME_SEL.select_one(soup))) or url_parts.get("name")
+        address = clean_text(_first(_ADDRESS_SEL.select_one(soup)))
+        city = url_parts.get("city") or clean_text(_first(_CITY_SEL.select_one(soup))) or "Karachi"
+        area = url_parts.get("area") or clean_text(_first(_AREA_SEL.select_one(soup)))
+        timing = clean_text(_first(_TIMING_SEL.select_one(soup)))
 
         # Extract specialties list from the hospital page
         specialties: List[str] = []
-        specialty_links = soup.select("a.hosp_prof_selected_speciality")
+        specialty_links = _SPECIALTY_LINK_SEL.select(soup)
         for link in specialty_links:
             spec_text = clean_text(link.get_text())
             if spec_text and spec_text not in specialties:
@@ -258,27 +423,27 @@ class HospitalParser:
         """
         doctors = []
         try:
-            about_section = soup.select_one("div.row.justify-content-center, div.col-12.col-md-8")
+            about_section = _ABOUT_SECTION_SEL.select_one(soup)
             if not about_section:
                 return doctors
             
             # Look for "Doctor list" section
-            for h2 in about_section.select("h2"):
+            for h2 in about_section.find_all("h2"):
                 h2_text = clean_text(h2.get_text())
                 if "Doctor list" in h2_text or "doctors" in h2_text.lower():
                     # Get the ul list after this h2
                     next_ul = h2.find_next_sibling("ul") or h2.find_next("ul")
                     if next_ul:
-                        for li in next_ul.select("li"):
+                        for li in next_ul.find_all("li"):
                             # Check for links
-                            link = li.select_one("a")
+                            link = li.find("a")
                             if link:
                                 doctor_name = clean_text(link.get_text())
                                 doctor_href = link.get("href")
                                 if doctor_name and doctor_href:
                                     # Only include doctor URLs, not hospital URLs
                                     if "/doctors/" in doctor_href:
-                                        profile_url = f"{BASE_URL}{doctor_href}" if doctor_href.startswith("/") else doctor_href
+                                        profile_url = urljoin(BASE_URL, doctor_href)
                                         doctors.append({
                                             "name": doctor_name,
                                             "profile_url": profile_url,
@@ -300,12 +465,12 @@ class HospitalParser:
         
         try:
             # Find the About section
-            about_section = soup.select_one("div.row.justify-content-center, div.col-12.col-md-8")
+            about_section = _ABOUT_SECTION_SEL.select_one(soup)
             
             if not about_section:
                 # Fallback: look for h2 containing "About"
-                for div in soup.select("div"):
-                    h2 = div.select_one("h2")
+                for div in soup.find_all("div"):
+                    h2 = div.find("h2")
                     if h2 and "About" in h2.get_text():
                         about_section = div
                         break
@@ -314,7 +479,7 @@ class HospitalParser:
                 full_text = about_section.get_text()
                 
                 # Extract full about text (all paragraphs)
-                paragraphs = about_section.select("p")
+                paragraphs = about_section.find_all("p")
                 about_parts = []
                 for p in paragraphs:
                     p_text = clean_text(p.get_text())
@@ -336,13 +501,13 @@ class HospitalParser:
                 # Extract achievements/proud moments
                 achievements = []
                 # Look for section with "Proud Moments" or "achievements"
-                for h2 in about_section.select("h2"):
+                for h2 in about_section.find_all("h2"):
                     h2_text = clean_text(h2.get_text())
                     if "Proud Moments" in h2_text or "achievements" in h2_text.lower():
                         # Get the ul list after this h2
                         next_ul = h2.find_next_sibling("ul") or h2.find_next("ul")
                         if next_ul:
-                            for li in next_ul.select("li"):
+                            for li in next_ul.find_all("li"):
                                 achievement_text = clean_text(li.get_text())
                                 if achievement_text:
                                     achievements.append(achievement_text)
@@ -353,12 +518,12 @@ class HospitalParser:
                 
                 # Extract clinical departments
                 departments = []
-                for h2 in about_section.select("h2"):
+                for h2 in about_section.find_all("h2"):
                     h2_text = clean_text(h2.get_text())
                     if "Clinical Departments" in h2_text:
                         next_ul = h2.find_next_sibling("ul") or h2.find_next("ul")
                         if next_ul:
-                            for li in next_ul.select("li"):
+                            for li in next_ul.find_all("li"):
                                 dept_text = clean_text(li.get_text())
                                 if dept_text and dept_text not in departments:
                                     departments.append(dept_text)
@@ -371,7 +536,7 @@ class HospitalParser:
                 procedures = {}
                 current_category = None
                 
-                for h3 in about_section.select("h3"):
+                for h3 in about_section.find_all("h3"):
                     h3_text = clean_text(h3.get_text())
                     # Check if it's a procedure category (contains numbers like "1-", "2-")
                     if re.match(r"^\d+[-–]", h3_text):
@@ -383,7 +548,7 @@ class HospitalParser:
                         # Get procedures from next ul
                         next_ul = h3.find_next_sibling("ul") or h3.find_next("ul")
                         if next_ul:
-                            for li in next_ul.select("li"):
+                            for li in next_ul.find_all("li"):
                                 proc_text = clean_text(li.get_text())
                                 if proc_text:
                                     procedures[category].append(proc_text)
@@ -393,14 +558,14 @@ class HospitalParser:
                 
                 # Extract facilities and services
                 facilities = []
-                for h2 in about_section.select("h2"):
+                for h2 in about_section.find_all("h2"):
                     h2_text = clean_text(h2.get_text())
                     if "Facilities and Services" in h2_text or "Facilities" in h2_text:
                         # Get all ul lists after this h2
                         next_elements = h2.find_next_siblings()
                         for elem in next_elements:
                             if elem.name == "ul":
-                                for li in elem.select("li"):
+                                for li in elem.find_all("li"):
                                     facility_text = clean_text(li.get_text())
                                     if facility_text:
                                         facilities.append(facility_text)
@@ -413,12 +578,12 @@ class HospitalParser:
                 
                 # Extract clinical support services
                 support_services = []
-                for h2 in about_section.select("h2"):
+                for h2 in about_section.find_all("h2"):
                     h2_text = clean_text(h2.get_text())
                     if "Clinical support services" in h2_text or "support services" in h2_text.lower():
                         next_ul = h2.find_next_sibling("ul") or h2.find_next("ul")
                         if next_ul:
-                            for li in next_ul.select("li"):
+                            for li in next_ul.find_all("li"):
                                 service_text = clean_text(li.get_text())
                                 if service_text:
                                     support_services.append(service_text)
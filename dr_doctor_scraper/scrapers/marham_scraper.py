@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Dict, List, Optional
-import time
+from collections import deque
+from datetime import datetime, timedelta
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from pymongo import UpdateOne
+from pymongo.collection import Collection
 
 from scrapers.base_scraper import BaseScraper
 from scrapers.database.mongo_client import MongoClientManager
@@ -18,12 +27,25 @@ from scrapers.marham.collectors.doctor_collector import DoctorCollector
 from scrapers.marham.collectors.city_collector import CityCollector
 from scrapers.marham.mergers.data_merger import DataMerger
 from scrapers.marham.handlers.hospital_practice_handler import HospitalPracticeHandler
+from scrapers.utils.http_cache import HttpPageCache
+from scrapers.utils.rate_limiter import RateLimiter
 from scrapers.utils.url_parser import is_hospital_url, parse_hospital_url
 
 BASE_URL = "https://www.marham.pk"
 HOSPITALS_LISTING = f"{BASE_URL}/hospitals/karachi?page="
+_DOCTOR_FIELDS = tuple(DoctorModel.model_fields)  # same keys and order as DoctorModel.model_dump()
+_VISIT_FIELDS = ("scraped_at", "content_hash")  # change on every visit, not part of the profile
 
 
+def _with_lookahead(items: Iterable[Any], depth: int = 1) -> Iterator[Tuple[Any, List[Any]]]:
+    """Yield (item, upcoming) pairs where `upcoming` holds up to `depth` following items."""
+    iterator = iter(items)
+    window: deque = deque(islice(iterator, depth + 1))
+    while window:
+        current = window.popleft()
+        window.extend(islice(iterator, 1))
+        yield current, list(window)
+
 class MarhamScraper(BaseScraper):
     """Hospital-first Marham scraper using modular components.
 
@@ -46,6 +68,18 @@ class MarhamScraper(BaseScraper):
     """
 
     PLATFORM = "marham"
+    WRITE_BATCH_SIZE = 500
+    AFFILIATION_BATCH_SIZE = 50  # Step 3 doctors whose hospital affiliations are looked up together
+    DOCTOR_TTL = timedelta(hours=24)  # profiles fetched more recently are not re-fetched by Step 3
+    PAGES_PER_SECOND = 2.0  # listing pages and doctor profiles
+    HOSPITALS_PER_SECOND = 1.0  # hospital pages in Step 2
+    HTTP_MAX_MISSES = 5  # consecutive incomplete HTTP fetches before the scraper sticks to the browser
+    HTTP_HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+        ),
+    }
 
     def __init__(
         self,
@@ -55,10 +89,48 @@ class MarhamScraper(BaseScraper):
         timeout_ms: int = 15000,
         max_retries: int = 3,
         disable_js: bool = False,
+        parse_workers: Optional[int] = None,
+        prefetch_depth: int = 4,
+        http_fetch: bool = True,
+        http_session: Optional[requests.Session] = None,
+        block_resources: bool = True,
+        http_cache_dir: Optional[str] = None,
     ) -> None:
-        super().__init__(headless=headless, timeout_ms=timeout_ms, max_retries=max_retries, disable_js=disable_js)
+        """Initialize the scraper.
+
+        `parse_workers` sizes the process pool used to parse HTML off the main
+        thread (None = one per CPU, 0 = parse inline). `prefetch_depth` is how
+        many upcoming listing pages, hospitals (Step 2) or doctor profiles
+        (Step 3) are kept loading concurrently.
+        `http_fetch` lets Steps 1-3 fetch listing pages, hospital pages and doctor
+        profiles over a keep-alive HTTP session, using the browser only for pages that
+        need rendering (or a "Load More" click);
+        `http_session` shares an existing session (and its connection pool)
+        instead of opening one, and is left open on exit. `block_resources`
+        aborts image, media, font and tracker requests in the browser.
+        `http_cache_dir` (default: the MARHAM_HTTP_CACHE_DIR environment variable)
+        keeps HTTP-fetched pages on disk and revalidates them with conditional
+        GETs, so unchanged pages are not downloaded again on the next run.
+        """
+        super().__init__(
+            headless=headless,
+            timeout_ms=timeout_ms,
+            max_retries=max_retries,
+            disable_js=disable_js,
+            prefetch_depth=prefetch_depth,
+            block_resources=block_resources,
+            lazy_browser=http_fetch,  # pages fetched over HTTP never need Chromium
+        )
         self.mongo_client = mongo_client
         self.hospitals_listing_url = hospitals_listing_url
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self.http_fetch = http_fetch
+        self._shared_http = http_session
+        self._http: Optional[requests.Session] = None
+        self._http_misses = 0
+        cache_dir = http_cache_dir or os.getenv("MARHAM_HTTP_CACHE_DIR")
+        self._http_cache: Optional[HttpPageCache] = HttpPageCache(cache_dir) if cache_dir else None
         
         # Initialize modular components
         self.hospital_parser = HospitalParser()
@@ -69,161 +141,150 @@ class MarhamScraper(BaseScraper):
         self.data_merger = DataMerger()
         self.practice_handler = HospitalPracticeHandler(mongo_client)
 
-    def _process_doctor(
-        self,
-        doctor: DoctorModel,
-        enriched_hospital: dict,
-        hosp_url: str,
-        seen_doctor_urls: set,
-        stats: Dict[str, int],
-    ) -> None:
-        """Process a single doctor: enrich, merge, and save.
-        
-        Args:
-            doctor: DoctorModel instance to process
-            enriched_hospital: Enriched hospital data dictionary
-            hosp_url: Hospital URL
-            seen_doctor_urls: Set of doctor URLs already processed in this run
-            stats: Statistics dictionary to update
-        """
-        # Skip if we've already seen this doctor URL in this run
-        if doctor.profile_url in seen_doctor_urls:
-            logger.info("Skipping duplicate doctor in this run: {}", doctor.profile_url)
-            stats["skipped"] += 1
-            return
-
-        seen_doctor_urls.add(doctor.profile_url)
+        # Polite pacing; time spent loading and parsing counts towards the interval
+        self.page_limiter = RateLimiter(rate=self.PAGES_PER_SECOND)
+        self.hospital_limiter = RateLimiter(rate=self.HOSPITALS_PER_SECOND)
+
+        # Buffered writes, sent with one bulk_write per WRITE_BATCH_SIZE operations
+        self._doctor_ops: List[UpdateOne] = []
+        self._hospital_ops: List[UpdateOne] = []
+
+    def __enter__(self) -> "MarhamScraper":
+        super().__enter__()
+        if self.parse_workers > 0:
+            self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+            logger.info("HTML parse pool started ({} workers)", self.parse_workers)
+        if self.http_fetch:
+            self._http = self._shared_http or self.new_http_session()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Queued writes must not be lost if a step stops early
+        self._flush_writes(self._hospital_ops, self.mongo_client.hospitals)
+        self._flush_writes(self._doctor_ops, self.mongo_client.doctors)
+        self.practice_handler.flush()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True, cancel_futures=True)
+            self._parse_pool = None
+        self._drop_http()
+        super().__exit__(exc_type, exc_val, exc_tb)
+
+    @classmethod
+    def new_http_session(cls, pool_size: int = 1) -> requests.Session:
+        """Create a keep-alive HTTP session for marham.pk.
 
-        # Attach hospital affiliation (only if it's a real hospital URL)
-        if is_hospital_url(hosp_url):
-            affiliation = {"name": enriched_hospital.get("name", ""), "url": hosp_url}
-            if not doctor.hospitals:
-                doctor.hospitals = []
-            # Avoid duplicate affiliations
-            existing_urls = {h.get("url") for h in doctor.hospitals if isinstance(h, dict) and h.get("url")}
-            if hosp_url not in existing_urls:
-                doctor.hospitals.append(affiliation)
+        Args:
+            pool_size: Connections kept open to the site; match it to the number
+                of threads sharing the session so none waits for a connection
 
-        # Enrich doctor from profile page
+        Returns:
+            requests.Session with the scraper's headers
+        """
+        session = requests.Session()
+        session.headers.update(cls.HTTP_HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _drop_http(self) -> None:
+        """Stop fetching over HTTP, closing the session unless it is shared."""
+        if self._http is not None and self._http is not self._shared_http:
+            self._http.close()
+        self._http = None
+
+    def _http_get(self, url: str) -> str:
+        """GET a page over the HTTP session, through the on-disk cache when one is configured."""
+        assert self._http is not None
+        timeout = self.timeout_ms / 1000
+        if self._http_cache is not None:
+            return self._http_cache.fetch(self._http, url, timeout)
+        response = self._http.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+
+    def _fetch_static_html(self, url: str, is_rendered: Callable[[str], bool]) -> Optional[str]:
+        """Fetch a page over the keep-alive HTTP session if the server already renders it.
+
+        Returns the HTML only if `is_rendered(html)` accepts it, otherwise None (the
+        caller loads the page with the browser). After HTTP_MAX_MISSES consecutive
+        misses the HTTP session is dropped and the browser (with prefetching) is used.
+        """
+        if self._http is None:
+            return None
         try:
-            if doctor.profile_url:
-                self.load_page(doctor.profile_url)
-                self.wait_for("body")
-                doc_html = self.get_html()
-                details = self.profile_enricher.parse_doctor_profile(doc_html)
-                
-                # Update doctor model with enriched data
-                if details.get("specialties"):
-                    doctor.specialty = details.get("specialties")
-                if details.get("pmdc_verified"):
-                    doctor.pmdc_verified = True
-                if details.get("qualifications"):
-                    doctor.qualifications = details.get("qualifications")
-                if details.get("experience_years"):
-                    doctor.experience_years = details.get("experience_years")
-                if details.get("work_history"):
-                    doctor.work_history = details.get("work_history")
-                if details.get("services"):
-                    doctor.services = details.get("services")
-                if details.get("diseases"):
-                    doctor.diseases = details.get("diseases")
-                if details.get("symptoms"):
-                    doctor.symptoms = details.get("symptoms")
-                if details.get("professional_statement"):
-                    doctor.professional_statement = details.get("professional_statement")
-                if details.get("patients_treated"):
-                    doctor.patients_treated = details.get("patients_treated")
-                if details.get("reviews_count"):
-                    doctor.reviews_count = details.get("reviews_count")
-                if details.get("patient_satisfaction_score"):
-                    doctor.patient_satisfaction_score = details.get("patient_satisfaction_score")
-                if details.get("phone"):
-                    doctor.phone = details.get("phone")
-                if details.get("consultation_types"):
-                    doctor.consultation_types = details.get("consultation_types")
-                
-                # Process practices: separate hospitals from private practice
-                for practice in details.get("practices", []):
-                    try:
-                        practice_url = practice.get("hospital_url")
-                        is_private = practice.get("is_private_practice", False)
-                        
-                        if is_private or not is_hospital_url(practice_url):
-                            # This is a private practice (video consultation, home visit, etc.)
-                            if not doctor.private_practice:
-                                doctor.private_practice = {
-                                    "name": practice.get("hospital_name") or f"{doctor.name}'s Private Practice",
-                                    "url": practice_url,
-                                    "fee": practice.get("fee"),
-                                    "timings": practice.get("timings"),
-                                }
-                        else:
-                            # This is a real hospital - add to doctor.hospitals
-                            if not doctor.hospitals:
-                                doctor.hospitals = []
-                            
-                            hosp_entry = {
-                                "name": practice.get("hospital_name"),
-                                "url": practice_url,
-                                "fee": practice.get("fee"),
-                                "timings": practice.get("timings"),
-                                "practice_id": practice.get("h_id"),
-                            }
-                            # Avoid duplicates by url
-                            existing_urls = {h.get("url") for h in doctor.hospitals if isinstance(h, dict) and h.get("url")}
-                            if practice_url and practice_url not in existing_urls:
-                                doctor.hospitals.append(hosp_entry)
-
-                            # Upsert hospital and add doctor entry into hospital.doctors
-                            self.practice_handler.upsert_hospital_practice(practice, doctor)
-                    except Exception:
-                        continue
-        except Exception:
-            logger.debug("Could not load or parse doctor profile: {}", doctor.profile_url)
+            html = self._http_get(url)
+            if is_rendered(html):
+                self._http_misses = 0
+                return html
+            self._http_misses += 1
+        except requests.RequestException as exc:
+            logger.debug("HTTP fetch failed for {}: {}", url, exc)
+            self._http_misses += 1
+
+        if self._http_misses >= self.HTTP_MAX_MISSES:
+            logger.info("Pages need the browser; disabling HTTP fetching")
+            self._drop_http()
+        return None
+
+    def _fetch_listing_page(self, url: str) -> Tuple[str, Dict[str, Dict[str, float]]]:
+        """Fetch a hospital listing page and the locations of its cards.
+
+        Listing pages come over HTTP when the server renders the cards
+        (`HospitalParser.is_rendered_listing`), with locations read from the HTML;
+        otherwise the page is loaded in the browser and locations come from its DOM.
+
+        Returns:
+            Tuple of (page HTML, mapping of hospital URL to 'lat'/'lng')
+        """
+        html = self._fetch_static_html(url, self.hospital_parser.is_rendered_listing)
+        if html is not None:
+            return html, self.hospital_parser.parse_card_locations(html)
+        self.load_page(url)
+        self.wait_for("body")
+        html = self.get_html()
+        return html, self.hospital_parser.extract_all_locations(self.page) if self.page else {}
+
+    def _fetch_profile_html(self, url: str) -> str:
+        """Fetch a doctor profile's HTML, over HTTP when possible, otherwise with the browser.
+
+        The HTTP response is used only if it already contains the profile markup
+        (`ProfileEnricher.is_rendered_profile`).
+        """
+        html = self._fetch_static_html(url, self.profile_enricher.is_rendered_profile)
+        if html is not None:
+            return html
+        self.load_page(url)
+        self.wait_for("body")
+        return self.get_html()
+
+    def _queue_write(self, ops: List[UpdateOne], collection: Collection, op: UpdateOne) -> None:
+        """Buffer a write operation, flushing the buffer once it reaches WRITE_BATCH_SIZE."""
+        ops.append(op)
+        if len(ops) >= self.WRITE_BATCH_SIZE:
+            self._flush_writes(ops, collection)
+
+    def _flush_writes(self, ops: List[UpdateOne], collection: Collection) -> None:
+        """Send buffered write operations in a single bulk write and clear the buffer."""
+        if ops:
+            self.mongo_client.bulk_update(collection, list(ops))
+            ops.clear()
+
+    def _submit_parse(self, func: Callable[..., Any], *args: Any) -> Future:
+        """Run a (picklable, module-level or static) parse function in the parse pool.
+
+        Falls back to running it inline when no pool is active, returning an
+        already-completed future so callers can treat both paths the same way.
+        """
+        if self._parse_pool is not None:
+            return self._parse_pool.submit(func, *args)
 
-        # Upsert doctor with merge (prevents data leaks - preserves existing data)
-        existing_doctor = self.mongo_client.doctors.find_one({"profile_url": doctor.profile_url})
-        
-        if existing_doctor:
-            # Merge existing data with new data (preserves existing fields, prevents data leaks)
-            merged = self.data_merger.merge_doctor_records(existing_doctor, doctor)
-            if merged:
-                try:
-                    # Update with merged data and set status to "processed"
-                    # Use $set to only update specified fields (prevents data leaks)
-                    self.mongo_client.doctors.update_one(
-                        {"profile_url": doctor.profile_url},
-                        {"$set": {**merged, "scrape_status": "processed"}}
-                    )
-                    # Also update status separately to ensure it's set
-                    self.mongo_client.update_doctor_status(doctor.profile_url, "processed")
-                    stats["updated"] += 1
-                    stats["doctors"] += 1
-                    logger.debug("Updated doctor: {} (status: processed)", doctor.profile_url)
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("Failed to update doctor {}: {}", doctor.profile_url, exc)
-                    stats["errors"] = stats.get("errors", 0) + 1
-            else:
-                # No changes needed, but ensure status is updated
-                self.mongo_client.update_doctor_status(doctor.profile_url, "processed")
-                stats["skipped"] += 1
-                stats["doctors"] += 1
-                logger.debug("Skipped doctor (no changes): {} (status: processed)", doctor.profile_url)
-        else:
-            # New doctor - insert with status "processed"
-            try:
-                doctor_dict = doctor.dict()
-                doctor_dict["scrape_status"] = "processed"
-                # Use insert_doctor which now uses upsert to prevent duplicates
-                self.mongo_client.insert_doctor(doctor_dict)
-                # Ensure status is set
-                self.mongo_client.update_doctor_status(doctor.profile_url, "processed")
-                stats["inserted"] += 1
-                stats["doctors"] += 1
-                logger.debug("Inserted new doctor: {} (status: processed)", doctor.profile_url)
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Failed to insert doctor {}: {}", doctor.profile_url, exc)
-                stats["errors"] = stats.get("errors", 0) + 1
+        future: Future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as exc:  # noqa: BLE001
+            future.set_exception(exc)
+        return future
 
     def scrape(self, limit: Optional[int] = None, step: Optional[int] = None) -> Dict[str, int]:
         """Resumable scraping workflow with four steps:
@@ -238,7 +299,10 @@ class MarhamScraper(BaseScraper):
         Returns stats dict similar to other scrapers.
         """
         logger.info("Starting resumable Marham scraping workflow")
-        stats = {"total": 0, "inserted": 0, "skipped": 0, "hospitals": 0, "updated": 0, "doctors": 0, "cities": 0}
+        stats = {
+            "total": 0, "inserted": 0, "skipped": 0, "hospitals": 0, "updated": 0,
+            "hospitals_unchanged": 0, "doctors": 0, "cities": 0,
+        }
 
         if step is None or step == 0:
             # Step 0: Collect cities
@@ -336,6 +400,7 @@ class MarhamScraper(BaseScraper):
                 
                 page = 1
                 city_collected = 0
+                last_page = 0  # highest page seen in the pagination so far
                 
                 while True:
                     # Build clean URL for this city and page
@@ -352,9 +417,7 @@ class MarhamScraper(BaseScraper):
                     )
                     
                     try:
-                        self.load_page(url)
-                        self.wait_for("body")
-                        html = self.get_html()
+                        html, locations = self._fetch_listing_page(url)
                         # Mark page as success
                         self.mongo_client.mark_page_success(url)
                     except Exception as exc:  # noqa: BLE001
@@ -371,28 +434,33 @@ class MarhamScraper(BaseScraper):
                         logger.info("No more hospitals found on page {} for city {}, stopping", page, city_name)
                         break
 
+                    # Start loading the following listing pages (up to the last linked one) while
+                    # this page is processed; load_page picks them up from the prefetch pool
+                    # (only needed while listing pages come from the browser)
+                    last_page = max(last_page, self.hospital_parser.parse_last_page(html) or 0)
+                    if self._http is None:
+                        prefetch_until = min(page + self.prefetch_depth, max(last_page, page + 1))
+                        for next_page in range(page + 1, prefetch_until + 1):
+                            self.prefetch_page(f"{BASE_URL}/hospitals/{city_slug}?page={next_page}")
+
+                    # Hospitals already in DB (by URL, the unique identifier), one query per page
+                    existing_urls = self.mongo_client.existing_hospital_urls(h.get("url") for h in hospitals)
+
                     for h in hospitals:
                         if not h.get("name") or not h.get("url"):
                             continue
 
                         hospital_url = h.get("url")
                         
-                        # Check if hospital already exists in DB by URL (unique identifier)
-                        existing = self.mongo_client.hospitals.find_one({"url": hospital_url})
-                        if existing:
+                        if hospital_url in existing_urls:
                             logger.debug("Hospital already in DB (skipping duplicate): {} ({})", h.get("name"), hospital_url)
                             city_collected += 1
                             continue
 
-                        # Extract location from "View Directions" button
-                        if self.page:
-                            try:
-                                location = self.hospital_parser.extract_location_from_card(self.page, h["url"])
-                                if location:
-                                    h["location"] = location
-                                    logger.debug("Extracted location for {}: {}", h.get("name"), location)
-                            except Exception as exc:  # noqa: BLE001
-                                logger.debug("Failed to extract location for {}: {}", h.get("name"), exc)
+                        location = locations.get(hospital_url)
+                        if location:
+                            h["location"] = location
+                            logger.debug("Extracted location for {}: {}", h.get("name"), location)
 
                         # Save minimal hospital record to DB with status="pending"
                         try:
@@ -408,10 +476,14 @@ class MarhamScraper(BaseScraper):
                             if h.get("location"):
                                 minimal["location"] = h["location"]
                             
-                            if self.mongo_client.update_hospital(h.get("url"), minimal):
-                                stats["hospitals"] += 1
-                                city_collected += 1
-                                logger.info("Saved hospital to DB: {} ({})", h.get("name"), h.get("url"))
+                            self._queue_write(
+                                self._hospital_ops,
+                                self.mongo_client.hospitals,
+                                UpdateOne({"url": hospital_url}, {"$setOnInsert": minimal}, upsert=True),
+                            )
+                            stats["hospitals"] += 1
+                            city_collected += 1
+                            logger.info("Saved hospital to DB: {} ({})", h.get("name"), h.get("url"))
                         except Exception as exc:  # noqa: BLE001
                             logger.warning("Failed to save hospital {}: {}", h.get("name"), exc)
 
@@ -421,9 +493,16 @@ class MarhamScraper(BaseScraper):
                     if limit and total_collected + city_collected >= limit:
                         break
 
+                    # The pagination links every following page, so none is left past the last one
+                    if last_page and page >= last_page:
+                        logger.info("Reached last page {} for city {}", page, city_name)
+                        break
+
                     page += 1
-                    time.sleep(0.5)
+                    self.page_limiter.acquire()
                 
+                self._flush_writes(self._hospital_ops, self.mongo_client.hospitals)
+
                 # Mark city as scraped if we collected hospitals
                 if city_collected > 0:
                     self.mongo_client.update_city_status(city_url, "scraped")
@@ -459,9 +538,7 @@ class MarhamScraper(BaseScraper):
             self.mongo_client.mark_page_retrying(url)
             
             try:
-                self.load_page(url)
-                self.wait_for("body")
-                html = self.get_html()
+                html, locations = self._fetch_listing_page(url)
                 
                 hospitals = self.hospital_parser.parse_hospital_cards(html)
                 if not hospitals:
@@ -472,6 +549,7 @@ class MarhamScraper(BaseScraper):
                 
                 # Process hospitals from this page
                 page_collected = 0
+                existing_urls = self.mongo_client.existing_hospital_urls(h.get("url") for h in hospitals)
                 for h in hospitals:
                     if not h.get("name") or not h.get("url"):
                         continue
@@ -479,19 +557,14 @@ class MarhamScraper(BaseScraper):
                     hospital_url = h.get("url")
                     
                     # Check if hospital already exists
-                    existing = self.mongo_client.hospitals.find_one({"url": hospital_url})
-                    if existing:
+                    if hospital_url in existing_urls:
                         page_collected += 1
                         continue
                     
                     # Extract location if possible
-                    if self.page:
-                        try:
-                            location = self.hospital_parser.extract_location_from_card(self.page, hospital_url)
-                            if location:
-                                h["location"] = location
-                        except Exception:
-                            pass
+                    location = locations.get(hospital_url)
+                    if location:
+                        h["location"] = location
                     
                     # Save minimal hospital record
                     try:
@@ -507,13 +580,19 @@ class MarhamScraper(BaseScraper):
                         if h.get("location"):
                             minimal["location"] = h["location"]
                         
-                        if self.mongo_client.update_hospital(hospital_url, minimal):
-                            stats["hospitals"] += 1
-                            page_collected += 1
-                            logger.info("Saved hospital from retried page: {} ({})", h.get("name"), hospital_url)
+                        self._queue_write(
+                            self._hospital_ops,
+                            self.mongo_client.hospitals,
+                            UpdateOne({"url": hospital_url}, {"$setOnInsert": minimal}, upsert=True),
+                        )
+                        stats["hospitals"] += 1
+                        page_collected += 1
+                        logger.info("Saved hospital from retried page: {} ({})", h.get("name"), hospital_url)
                     except Exception as exc:
                         logger.warning("Failed to save hospital from retried page: {}", exc)
-                
+
+                self._flush_writes(self._hospital_ops, self.mongo_client.hospitals)
+
                 # Mark page as success
                 self.mongo_client.mark_page_success(url)
                 logger.info("Successfully processed retried page: {} ({} hospitals)", url, page_collected)
@@ -523,284 +602,405 @@ class MarhamScraper(BaseScraper):
                 # Mark as failed again (will increment retry_count)
                 self.mongo_client.mark_page_failed(url, str(exc))
             
-            time.sleep(0.5)  # Polite pause between pages
+            self.page_limiter.acquire()  # Polite pacing between pages
 
     def _step2_enrich_hospitals_and_collect_doctors(self, limit: Optional[int], stats: Dict[str, int]) -> None:
-        """Step 2: Read hospitals from DB, enrich them, collect doctor URLs, and save to DB."""
+        """Step 2: Read hospitals from DB, enrich them, collect doctor URLs, and save to DB.
+
+        Hospital pages whose doctor cards are server-rendered and complete (no
+        "Load More") are fetched over HTTP; the rest use the browser, with the next
+        `prefetch_depth` hospital pages loading on secondary browser pages while the
+        current hospital is parsed and its doctors collected.
+        """
         logger.info("Step 2: Enriching hospitals and collecting doctor URLs")
         
-        # Get hospitals that need enrichment/doctor collection
-        hospitals_cursor = self.mongo_client.get_hospitals_needing_doctor_collection(limit=limit)
-        hospitals_to_process = list(hospitals_cursor)
-        
-        logger.info("Found {} hospitals needing enrichment/doctor collection", len(hospitals_to_process))
-        
-        for hospital_doc in hospitals_to_process:
-            hosp_url = hospital_doc.get("url")
-            if not hosp_url:
-                continue
-            try:
-                logger.info("Processing hospital: {} ({})", hospital_doc.get("name"), hosp_url)
-                
-                # Load hospital page and enrich hospital doc
-                self.load_page(hosp_url)
-                self.wait_for("body")
-                hosp_html = self.get_html()
-                enriched = self.hospital_parser.parse_full_hospital(hosp_html, hosp_url)
-
-                # Preserve location from existing record if enriched data doesn't have it
-                if hospital_doc.get("location") and not enriched.get("location"):
-                    enriched["location"] = hospital_doc["location"]
-
-                # Update hospital with enriched data
-                enriched["scrape_status"] = "enriched"  # Will be updated to "doctors_collected" after collecting doctors
-                try:
-                    if self.mongo_client.update_hospital(hosp_url, enriched):
-                        stats["updated"] += 1
-                        logger.info("Enriched hospital: {}", hosp_url)
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("Failed to update hospital {}: {}", hosp_url, exc)
+        # Get hospitals that need enrichment/doctor collection.
+        # Stream the cursor instead of materializing the whole result set.
+        hospitals_cursor = self.mongo_client.get_hospitals_needing_doctor_collection(
+            limit=limit,
+            batch_size=50,
+            no_cursor_timeout=True,
+            projection={"url": 1, "name": 1, "location": 1},
+        )
+        processed = 0
+
+        with hospitals_cursor:
+            for hospital_doc, upcoming_docs in _with_lookahead(hospitals_cursor, self.prefetch_depth):
+                hosp_url = hospital_doc.get("url")
+                if not hosp_url:
                     continue
+                processed += 1
+                try:
+                    logger.debug("Processing hospital: {} ({})", hospital_doc.get("name"), hosp_url)
+                
+                    # Load hospital page (over HTTP unless it needs the browser) and hand the HTML off for parsing
+                    hosp_html = self._fetch_static_html(hosp_url, self.doctor_collector.is_rendered_hospital)
+                    in_browser = hosp_html is None or self.doctor_collector.has_load_more(hosp_html)
+                    if in_browser:
+                        self.load_page(hosp_url)
+                        self.wait_for("body")
+                        hosp_html = self.get_html()
+
+                    # Start loading the next hospitals on secondary pages while this one is processed
+                    # (only needed while hospital pages come from the browser)
+                    if self._http is None:
+                        for next_doc in upcoming_docs:
+                            if next_doc.get("url"):
+                                self.prefetch_page(next_doc["url"])
+                    parsed_future = self._submit_parse(self.hospital_parser.parse_hospital_page, hosp_html, hosp_url)
+
+                    # Collect doctor cards (clicks Load More on the page already open) while parsing runs.
+                    # A failure here is re-raised after the enriched data has been saved.
+                    cards_error: Optional[Exception] = None
+                    try:
+                        if in_browser:
+                            cards = self.doctor_collector.collect_doctor_cards_from_hospital(self, hosp_url, hosp_html)
+                        else:
+                            cards = self.doctor_collector.parse_doctor_cards(hosp_html)
+                    except Exception as exc:  # noqa: BLE001
+                        cards, cards_error = [], exc
+
+                    enriched, doctors_from_list = parsed_future.result()
 
-                # Collect doctor names and URLs from hospital page
-                cards = self.doctor_collector.collect_doctor_cards_from_hospital(self, hosp_url)
-                hospital_doctors_list = []
-                seen_doctor_urls_in_hosp = set()
+                    # Hash the parsed page first (same as the multi-threaded worker), so the hash
+                    # does not depend on what is already stored
+                    self._stamp_hospital_hash(enriched, hosp_url)
+
+                    # Preserve location from existing record if enriched data doesn't have it
+                    if hospital_doc.get("location") and not enriched.get("location"):
+                        enriched["location"] = hospital_doc["location"]
+
+                    # Update hospital with enriched data (skipped on the server if the hash matches). The
+                    # status is only written with changed content; add_hospital_doctors below sets the
+                    # final "doctors_collected" status either way
+                    enriched["scrape_status"] = "enriched"
+                    try:
+                        if self.mongo_client.update_hospital(hosp_url, enriched):
+                            stats["updated"] += 1
+                            logger.info("Enriched hospital: {}", hosp_url)
+                        else:
+                            stats["hospitals_unchanged"] += 1
+                    except Exception as exc:  # noqa: BLE001
+                        logger.warning("Failed to update hospital {}: {}", hosp_url, exc)
+                        continue
+
+                    if cards_error is not None:
+                        raise cards_error
+
+                    # Collect doctor names and URLs from hospital page, deduplicated by
+                    # profile_url as they are found (first source wins, order preserved)
+                    hospital_doctors: Dict[str, dict] = {}
                 
-                # Collect from doctor cards
-                for card in cards:
-                    doctor = self.doctor_parser.parse_doctor_card(card, hosp_url)
-                    if doctor and doctor.profile_url and doctor.profile_url not in seen_doctor_urls_in_hosp:
-                        hospital_doctors_list.append({
-                            "name": doctor.name,
-                            "profile_url": doctor.profile_url,
-                        })
-                        seen_doctor_urls_in_hosp.add(doctor.profile_url)
-                        
-                        # Save minimal doctor record to DB for later processing
-                        self.mongo_client.upsert_minimal_doctor(doctor.profile_url, doctor.name, hosp_url)
-
-                # Also extract doctors from the About section doctor list
-                doctors_from_list = self.doctor_parser.extract_doctors_from_list(hosp_html, hosp_url)
-                for doctor_info in doctors_from_list:
-                    profile_url = doctor_info["profile_url"]
-                    if profile_url and profile_url not in seen_doctor_urls_in_hosp:
-                        hospital_doctors_list.append({
-                            "name": doctor_info["name"],
-                            "profile_url": profile_url,
-                        })
-                        seen_doctor_urls_in_hosp.add(profile_url)
-                        
-                        # Save minimal doctor record to DB
-                        self.mongo_client.upsert_minimal_doctor(profile_url, doctor_info["name"], hosp_url)
+                    # Collect from doctor cards
+                    for card in cards:
+                        doctor = self.doctor_parser.parse_doctor_card(card, hosp_url)
+                        if doctor and doctor.profile_url and doctor.profile_url not in hospital_doctors:
+                            hospital_doctors[doctor.profile_url] = {
+                                "name": doctor.name,
+                                "profile_url": doctor.profile_url,
+                            }
+
+                    # Also add doctors from the About section doctor list
+                    for doctor_info in doctors_from_list:
+                        profile_url = doctor_info["profile_url"]
+                        if profile_url and profile_url not in hospital_doctors:
+                            hospital_doctors[profile_url] = {
+                                "name": doctor_info["name"],
+                                "profile_url": profile_url,
+                            }
                 
-                # Also get doctors from enriched data (from About section parser)
-                if enriched.get("doctors"):
-                    for doc_info in enriched.get("doctors", []):
+                    # Also get doctors from enriched data (from About section parser)
+                    for doc_info in enriched.get("doctors") or []:
                         profile_url = doc_info.get("profile_url")
-                        if profile_url and profile_url not in seen_doctor_urls_in_hosp:
-                            hospital_doctors_list.append(doc_info)
-                            seen_doctor_urls_in_hosp.add(profile_url)
-                            
-                            # Save minimal doctor record to DB
-                            self.mongo_client.upsert_minimal_doctor(profile_url, doc_info.get("name", ""), hosp_url)
+                        if profile_url and profile_url not in hospital_doctors:
+                            hospital_doctors[profile_url] = doc_info
+
+                    hospital_doctors_list = list(hospital_doctors.values())
+
+                    # Save minimal doctor records to DB for later processing (one lookup + one bulk write)
+                    self.mongo_client.upsert_minimal_doctors(hospital_doctors_list)
                 
-                # Update hospital with doctor list and mark as "doctors_collected"
-                try:
-                    # Merge with existing doctors list
-                    existing_hosp = self.mongo_client.hospitals.find_one({"url": hosp_url})
-                    existing_doctors = existing_hosp.get("doctors", []) if existing_hosp else []
-                    
-                    # Create a map of existing doctors by profile_url
-                    existing_map = {d.get("profile_url"): d for d in existing_doctors if isinstance(d, dict) and d.get("profile_url")}
-                    
-                    # Merge new doctors
-                    for new_doc in hospital_doctors_list:
-                        profile_url = new_doc.get("profile_url")
-                        if profile_url and profile_url not in existing_map:
-                            existing_doctors.append(new_doc)
-                    
-                    # Update hospital with doctors list and status
-                    self.mongo_client.hospitals.update_one(
-                        {"url": hosp_url},
-                        {"$set": {"doctors": existing_doctors, "scrape_status": "doctors_collected"}},
-                        upsert=True
-                    )
-                    logger.info("Updated hospital {} with {} doctors, status set to 'doctors_collected'", hosp_url, len(existing_doctors))
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("Failed to update hospital doctors list for {}: {}", hosp_url, exc)
+                    # Add new doctors to the hospital's list (server-side merge) and mark as "doctors_collected"
+                    if self.mongo_client.add_hospital_doctors(hosp_url, hospital_doctors_list, status="doctors_collected"):
+                        logger.info("Updated hospital {} with {} doctors, status set to 'doctors_collected'", hosp_url, len(hospital_doctors_list))
 
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Failed processing hospital {}: {}", hosp_url, exc)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Failed processing hospital {}: {}", hosp_url, exc)
 
-            # polite pause between hospitals
-            time.sleep(1)
+                # polite pacing between hospitals
+                self.hospital_limiter.acquire()
 
-        logger.info("Step 2 complete: Hospitals enriched and doctor URLs collected")
+        logger.info(
+            "Step 2 complete: {} hospitals enriched and doctor URLs collected ({} unchanged)",
+            processed,
+            stats["hospitals_unchanged"],
+        )
 
     def _step3_process_doctors(self, stats: Dict[str, int]) -> None:
-        """Step 3: Read doctors from DB and process their profiles."""
+        """Step 3: Read doctors from DB and process their profiles.
+
+        Work is pipelined: while doctor N is parsed (in the parse pool, if enabled),
+        the pages of doctors N+1..N+prefetch_depth are already being fetched on
+        secondary browser pages and doctor N-1 is saved.
+        """
         logger.info("Step 3: Processing doctors from DB")
         
-        # Get doctors that need processing
-        doctors_cursor = self.mongo_client.get_doctors_needing_processing()
-        doctors_to_process = list(doctors_cursor)
-        
-        logger.info("Found {} doctors needing processing", len(doctors_to_process))
-
-        for doctor_doc in doctors_to_process:
-            try:
+        # Get doctors that need processing (streamed, not materialized)
+        doctors_cursor = self.mongo_client.get_doctors_needing_processing(
+            batch_size=50, no_cursor_timeout=True, fresh_within=self.DOCTOR_TTL
+        )
+        processed = 0
+        pending = None  # (doctor_doc, details_future, affiliations) waiting to be saved
+        affiliations: Dict[str, List[dict]] = {}  # profile_url -> hospitals listing that doctor
+        lookahead = max(self.prefetch_depth, self.AFFILIATION_BATCH_SIZE)
+
+        with doctors_cursor:
+            for doctor_doc, upcoming_docs in _with_lookahead(doctors_cursor, lookahead):
                 profile_url = doctor_doc.get("profile_url")
                 if not profile_url:
+                    stats["skipped"] += 1
                     continue
-                    
+
                 stats["total"] += 1
-                logger.info("Processing doctor: {} ({})", doctor_doc.get("name"), profile_url)
-
-                # Load doctor profile page
-                self.load_page(profile_url)
-                self.wait_for("body")
-                doc_html = self.get_html()
-                details = self.profile_enricher.parse_doctor_profile(doc_html)
-
-                # Create or update doctor model from existing doc
-                # Filter out MongoDB-specific fields and ensure all required fields are present
-                doctor_data = {k: v for k, v in doctor_doc.items() if k != "_id"}
-                # Ensure specialty is a list (it might be missing or empty)
-                if "specialty" not in doctor_data or not doctor_data["specialty"]:
-                    doctor_data["specialty"] = []
-                doctor = DoctorModel(**doctor_data)
-
-                # Update doctor with enriched data
-                if details.get("specialties"):
-                    doctor.specialty = details.get("specialties")
-                if details.get("pmdc_verified"):
-                    doctor.pmdc_verified = True
-                if details.get("qualifications"):
-                    doctor.qualifications = details.get("qualifications")
-                if details.get("experience_years"):
-                    doctor.experience_years = details.get("experience_years")
-                if details.get("work_history"):
-                    doctor.work_history = details.get("work_history")
-                if details.get("services"):
-                    doctor.services = details.get("services")
-                if details.get("diseases"):
-                    doctor.diseases = details.get("diseases")
-                if details.get("symptoms"):
-                    doctor.symptoms = details.get("symptoms")
-                if details.get("professional_statement"):
-                    doctor.professional_statement = details.get("professional_statement")
-                if details.get("patients_treated"):
-                    doctor.patients_treated = details.get("patients_treated")
-                if details.get("reviews_count"):
-                    doctor.reviews_count = details.get("reviews_count")
-                if details.get("patient_satisfaction_score"):
-                    doctor.patient_satisfaction_score = details.get("patient_satisfaction_score")
-                if details.get("phone"):
-                    doctor.phone = details.get("phone")
-                if details.get("consultation_types"):
-                    doctor.consultation_types = details.get("consultation_types")
-
-                # Process practices: separate hospitals from private practice
-                if not doctor.hospitals:
-                    doctor.hospitals = []
-                
-                for practice in details.get("practices", []):
+                processed += 1
+                details_future = None
+                try:
+                    logger.debug("Processing doctor: {} ({})", doctor_doc.get("name"), profile_url)
+
+                    # Fetch doctor profile page and hand the HTML off for parsing
+                    doc_html = self._fetch_profile_html(profile_url)
+                    details_future = self._submit_parse(self.profile_enricher.parse_doctor_profile, doc_html)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Failed processing doctor {}: {}", profile_url, exc)
+                    stats["skipped"] += 1
+
+                # Keep the next profiles loading while this one is parsed and the previous one saved
+                # (only needed while profiles come from the browser)
+                if self._http is None:
+                    for next_doc in upcoming_docs[:self.prefetch_depth]:
+                        if next_doc.get("profile_url"):
+                            self.prefetch_page(next_doc["profile_url"])
+
+                # Look up hospital affiliations for this and the upcoming doctors in one query
+                if profile_url not in affiliations:
+                    batch_urls = [profile_url] + [
+                        d["profile_url"] for d in upcoming_docs
+                        if d.get("profile_url") and d["profile_url"] not in affiliations
+                    ]
                     try:
-                        is_private = practice.get("is_private_practice", False)
-                        practice_url = practice.get("practice_url")  # Booking/appointment URL
-                        hospital_url = practice.get("hospital_url")  # Hospital URL (if it's a hospital)
-                        
-                        if is_private:
-                            # Private practice (video consultation, etc.)
-                            # Use practice_url (the booking URL) for private practice
-                            if not doctor.private_practice:
-                                doctor.private_practice = {
-                                    "name": practice.get("hospital_name") or f"{doctor.name}'s Private Practice",
-                                    "url": practice_url,  # Use the booking/consultation URL
-                                    "fee": practice.get("fee"),
-                                    "timings": practice.get("timings"),
-                                }
-                        else:
-                            # Real hospital - add to doctor.hospitals
-                            # For hospitals, we need to construct or find the actual hospital URL
-                            # The practice_url might be a callcenter link, but we need the hospital page URL
-                            # For now, use hospital_url if available, otherwise try to construct from practice_url
-                            hosp_url = hospital_url
-                            if not hosp_url and practice_url:
-                                # Try to extract hospital info from practice_url
-                                # If practice_url contains hospital info, we can use it
-                                # Otherwise, we'll need to look it up
-                                if is_hospital_url(practice_url):
-                                    hosp_url = practice_url
-                            
-                            if hosp_url:
-                                hosp_entry = {
-                                    "name": practice.get("hospital_name"),
-                                    "url": hosp_url,
-                                    "fee": practice.get("fee"),
-                                    "timings": practice.get("timings"),
-                                    "practice_id": practice.get("h_id"),
-                                    "area": practice.get("area"),
-                                }
-                                # Add location if available
-                                if practice.get("lat") and practice.get("lng"):
-                                    hosp_entry["location"] = {
-                                        "lat": practice.get("lat"),
-                                        "lng": practice.get("lng"),
-                                    }
-                                
-                                # Avoid duplicates by url
-                                existing_urls = {h.get("url") for h in doctor.hospitals if isinstance(h, dict) and h.get("url")}
-                                if hosp_url not in existing_urls:
-                                    doctor.hospitals.append(hosp_entry)
-
-                                # Update hospital.doctors with this doctor's info and save hospital with location
-                                # Make sure practice dict has hospital_url set for the handler
-                                practice["hospital_url"] = hosp_url
-                                self.practice_handler.upsert_hospital_practice(practice, doctor)
+                        found = self.mongo_client.get_hospital_affiliations(batch_urls)
                     except Exception as exc:  # noqa: BLE001
-                        logger.debug("Error processing practice: {}", exc)
-                        continue
+                        logger.warning("Failed to look up hospital affiliations: {}", exc)
+                        found = {}
+                    for url in batch_urls:
+                        affiliations[url] = found.get(url, [])
 
-                # Also add hospitals from hospitals collection where this doctor is listed
-                # Find hospitals that have this doctor in their doctors list
-                hospitals_with_doctor = self.mongo_client.hospitals.find({
-                    "doctors.profile_url": profile_url
-                })
-                
-                for hosp_doc in hospitals_with_doctor:
-                    hosp_url = hosp_doc.get("url")
-                    if hosp_url and is_hospital_url(hosp_url):
-                        existing_urls = {h.get("url") for h in doctor.hospitals if isinstance(h, dict) and h.get("url")}
-                        if hosp_url not in existing_urls:
-                            doctor.hospitals.append({
-                                "name": hosp_doc.get("name", ""),
-                                "url": hosp_url,
-                            })
+                # Save the previous doctor while this one is being parsed
+                if pending:
+                    self._finish_step3_doctor(*pending, stats)
+                doctor_affiliations = affiliations.pop(profile_url, [])
+                pending = (doctor_doc, details_future, doctor_affiliations) if details_future else None
 
-                # Save doctor with updated status
-                doctor_dict = doctor.dict()
-                doctor_dict["scrape_status"] = "processed"
-                
-                try:
-                    self.mongo_client.doctors.update_one(
-                        {"profile_url": profile_url},
-                        {"$set": doctor_dict}
-                    )
-                    stats["updated"] += 1
-                    stats["doctors"] += 1
-                    logger.info("Processed and saved doctor: {}", profile_url)
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("Failed to update doctor {}: {}", profile_url, exc)
-                    stats["skipped"] += 1
+                # polite pacing between doctors
+                self.page_limiter.acquire()
 
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Failed processing doctor {}: {}", doctor_doc.get("profile_url"), exc)
+            if pending:
+                self._finish_step3_doctor(*pending, stats)
+
+            # write any doctors and hospital practices still queued by _finish_step3_doctor
+            self._flush_writes(self._doctor_ops, self.mongo_client.doctors)
+            self.practice_handler.flush()
+
+        logger.info("Step 3 complete: {} doctors processed", processed)
+
+    def _finish_step3_doctor(
+        self,
+        doctor_doc: dict,
+        details_future: Future,
+        hospital_affiliations: List[dict],
+        stats: Dict[str, int],
+    ) -> None:
+        """Merge parsed profile details into the doctor and save it (Step 3).
+
+        Args:
+            doctor_doc: Doctor document read from the database
+            details_future: Future resolving to `ProfileEnricher.parse_doctor_profile` output
+            hospital_affiliations: Hospitals (`url`, `name`) whose doctors list includes this doctor
+            stats: Statistics dictionary to update
+        """
+        profile_url = doctor_doc.get("profile_url")
+        try:
+            details = details_future.result()
+            _, update = self._build_doctor_update(doctor_doc, details, hospital_affiliations)
+            if not update:
                 stats["skipped"] += 1
+                stats["doctors"] += 1
+                logger.debug("Doctor unchanged, skipping write: {}", profile_url)
+                return
+
+            self._queue_write(self._doctor_ops, self.mongo_client.doctors, self._doctor_update_op(profile_url, update))
+            stats["updated"] += 1
+            stats["doctors"] += 1
+            logger.info("Processed and saved doctor: {}", profile_url)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed processing doctor {}: {}", profile_url, exc)
+            stats["skipped"] += 1
+
+    @staticmethod
+    def _doctor_update_op(profile_url: str, update: dict) -> UpdateOne:
+        """Wrap a Step 3 doctor update in an UpdateOne keyed by profile_url.
+
+        Updates that store a new `content_hash` only match while the stored hash
+        differs, so a profile already saved with the same content (e.g. by another
+        worker) is a no-op on the server.
+        """
+        query: Dict[str, Any] = {"profile_url": profile_url}
+        new_hash = update.get("$set", {}).get("content_hash")
+        if new_hash:
+            query["content_hash"] = {"$ne": new_hash}
+        return UpdateOne(query, update)
 
-            # polite pause between doctors
-            time.sleep(0.5)
+    def _stamp_hospital_hash(self, enriched: dict, hospital_url: str) -> None:
+        """Set the canonical `url` and the `content_hash` of parsed Step 2 hospital data.
 
-        logger.info("Step 3 complete: {} doctors processed", len(doctors_to_process))
+        Shared by Step 2 and the multi-threaded Step 2 worker so both hash the same
+        fields: the parsed page with its URL, without status or an earlier hash.
 
+        Args:
+            enriched: Output of `HospitalParser.parse_hospital_page` (updated in place)
+            hospital_url: URL the hospital is stored under
+        """
+        enriched["url"] = hospital_url
+        canonical = {k: v for k, v in enriched.items() if k not in ("content_hash", "scrape_status")}
+        enriched["content_hash"] = self.data_merger.content_hash(canonical)
+
+    def _build_doctor_update(
+        self,
+        doctor_doc: dict,
+        details: dict,
+        hospital_affiliations: List[dict],
+    ) -> Tuple[DoctorModel, Optional[dict]]:
+        """Apply parsed profile details to a stored doctor and build its MongoDB update.
+
+        Shared by Step 3 and the multi-threaded Step 3 worker. Hospital practice
+        upserts are queued on `practice_handler` (callers flush them); the doctors
+        collection itself is not touched.
+
+        Args:
+            doctor_doc: Doctor document read from the database
+            details: Output of `ProfileEnricher.parse_doctor_profile`
+            hospital_affiliations: Hospitals (`url`, `name`) whose doctors list includes this doctor
+
+        Returns:
+            Tuple of (updated DoctorModel, update document or None if nothing changed).
+            When the profile's `content_hash` matches the stored one, the model is
+            returned as stored and the update only refreshes status and `scraped_at`.
+        """
+        # Create or update doctor model from existing doc
+        # Filter out MongoDB-specific fields and ensure all required fields are present
+        doctor_data = {k: v for k, v in doctor_doc.items() if k != "_id"}
+        # Ensure specialty is a list (it might be missing or empty)
+        if "specialty" not in doctor_data or not doctor_data["specialty"]:
+            doctor_data["specialty"] = []
+        # Documents come from our own collection (validated on write), so skip validation
+        doctor = DoctorModel.model_construct(**doctor_data)
+
+        # Same profile and affiliations as the last time it was processed: nothing to merge
+        # or upsert, only record the visit
+        digest = self.data_merger.content_hash({
+            "details": details,
+            "affiliations": sorted(h.get("url") or "" for h in hospital_affiliations),
+        })
+        if doctor_doc.get("content_hash") == digest:
+            return doctor, {"$set": {"scrape_status": "processed", "scraped_at": datetime.utcnow()}}
+        doctor.content_hash = digest
+
+        # Update doctor with enriched data
+        self.data_merger.apply_profile_details(doctor, details)
+
+        # Process practices: separate hospitals from private practice. The list is copied so
+        # appending does not also change doctor_doc, which the delta update compares against
+        doctor.hospitals = list(doctor.hospitals or [])
+        # Hospital URLs already attached, kept in sync as entries are appended
+        seen_hosp_urls = {h.get("url") for h in doctor.hospitals if isinstance(h, dict) and h.get("url")}
+
+        for practice in details.get("practices", []):
+            try:
+                is_private = practice.get("is_private_practice", False)
+                practice_url = practice.get("practice_url")  # Booking/appointment URL
+                hospital_url = practice.get("hospital_url")  # Hospital URL (if it's a hospital)
+                hospital_name = practice.get("hospital_name")
+                fee = practice.get("fee")
+                timings = practice.get("timings")
+
+                if is_private:
+                    # Private practice (video consultation, etc.)
+                    # Use practice_url (the booking URL) for private practice
+                    if not doctor.private_practice:
+                        doctor.private_practice = {
+                            "name": hospital_name or f"{doctor.name}'s Private Practice",
+                            "url": practice_url,  # Use the booking/consultation URL
+                            "fee": fee,
+                            "timings": timings,
+                        }
+                else:
+                    # Real hospital - add to doctor.hospitals
+                    # For hospitals, we need to construct or find the actual hospital URL
+                    # The practice_url might be a callcenter link, but we need the hospital page URL
+                    # For now, use hospital_url if available, otherwise try to construct from practice_url
+                    hosp_url = hospital_url
+                    if not hosp_url and practice_url:
+                        # Try to extract hospital info from practice_url
+                        # If practice_url contains hospital info, we can use it
+                        # Otherwise, we'll need to look it up
+                        if is_hospital_url(practice_url):
+                            hosp_url = practice_url
+
+                    if hosp_url:
+                        # Avoid duplicates by url (the entry is only built for new hospitals)
+                        if hosp_url not in seen_hosp_urls:
+                            hosp_entry = {
+                                "name": hospital_name,
+                                "url": hosp_url,
+                                "fee": fee,
+                                "timings": timings,
+                                "practice_id": practice.get("h_id"),
+                                "area": practice.get("area"),
+                            }
+                            # Add location if available
+                            lat, lng = practice.get("lat"), practice.get("lng")
+                            if lat and lng:
+                                hosp_entry["location"] = {"lat": lat, "lng": lng}
+                            doctor.hospitals.append(hosp_entry)
+                            seen_hosp_urls.add(hosp_url)
+
+                        # Update hospital.doctors with this doctor's info and save hospital with location
+                        # Make sure practice dict has hospital_url set for the handler
+                        practice["hospital_url"] = hosp_url
+                        self.practice_handler.queue_upsert(practice, doctor)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Error processing practice: {}", exc)
+                continue
+
+        # Also add hospitals from hospitals collection where this doctor is listed
+        for hosp_doc in hospital_affiliations:
+            hosp_url = hosp_doc.get("url")
+            if hosp_url and hosp_url not in seen_hosp_urls and is_hospital_url(hosp_url):
+                doctor.hospitals.append({
+                    "name": hosp_doc.get("name", ""),
+                    "url": hosp_url,
+                })
+                seen_hosp_urls.add(hosp_url)
+
+        # Only the fields that changed, with the doctor marked as processed. The timestamp and
+        # hash differ on every visit, so they are left out of the comparison and only added to
+        # a non-empty delta; otherwise the caller skips the write.
+        # Plain field values: the delta only needs them compared, not re-serialized like model_dump does
+        doctor_dict = {field: getattr(doctor, field) for field in _DOCTOR_FIELDS if field not in _VISIT_FIELDS}
+        doctor_dict["scrape_status"] = "processed"
+        update = self.data_merger.build_delta_update(doctor_doc, doctor_dict)
+        if update is None:
+            return doctor, None
+        doctor.scraped_at = datetime.utcnow()
+        update.setdefault("$set", {}).update(scraped_at=doctor.scraped_at, content_hash=digest)
+        return doctor, update
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field, validator
 
+_FEE_NON_DIGITS_RE = re.compile(r"\D+")
+
 
 class DoctorModel(BaseModel):
     name: str
@@ -36,6 +39,8 @@ class DoctorModel(BaseModel):
     platform: str
     # Scraping status: "pending" (just URL collected), "processed" (full profile processed)
     scrape_status: Optional[str] = "pending"
+    # Digest of the last parsed profile (see DataMerger.content_hash); unchanged profiles skip the merge
+    content_hash: Optional[str] = None
     scraped_at: datetime = Field(default_factory=datetime.utcnow)
 
     @validator("name", "city", pre=True)
@@ -59,8 +64,8 @@ class DoctorModel(BaseModel):
             return None
         if isinstance(v, (int, float)):
             return int(v)
-        # attempt to extract numbers like "PKR 1,500" or "1500 Rs"
-        digits = "".join(ch for ch in str(v) if ch.isdigit())
+        # keep only the digits, e.g. "PKR 1,500", "1 500" or "1500 Rs" -> 1500
+        digits = _FEE_NON_DIGITS_RE.sub("", str(v))
         return int(digits) if digits else None
 
     @validator("rating", pre=True)
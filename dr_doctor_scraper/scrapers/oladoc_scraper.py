@@ -1,15 +1,58 @@
 from __future__ import annotations
 
+import re
 from typing import Dict, List, Optional
 
-from bs4 import BeautifulSoup
+import requests
+import soupsieve as sv
+from bs4 import SoupStrainer
+from bs4.filter import ElementFilter
+from pymongo import UpdateOne
 
 from scrapers.base_scraper import BaseScraper
 from scrapers.database.mongo_client import MongoClientManager
 from scrapers.models.doctor_model import DoctorModel
-from scrapers.utils.parser_helpers import clean_text, extract_number, normalize_fee
+from scrapers.utils.parser_helpers import clean_text, extract_number, make_soup, normalize_fee
 from scrapers.logger import logger
 
+# Generic Oladoc selectors, compiled once at import (run for every profile)
+_PROFILE_LINK_SEL = sv.compile("a[href*='/doctors/']")
+_SPECIALTY_SEL = sv.compile(".speciality, .specialties li, .doctor-specialities li")
+_FEE_SEL = sv.compile(".fee, .doctor-fee, .consultation-fee")
+_CITY_SEL = sv.compile(".city, .doctor-city")
+_AREA_SEL = sv.compile(".area, .doctor-area")
+_HOSPITAL_SEL = sv.compile(".hospital, .doctor-hospital")
+_ADDRESS_SEL = sv.compile(".address, .clinic-address")
+_RATING_SEL = sv.compile(".rating, .doctor-rating span")
+_EXPERIENCE_SEL = sv.compile(".experience, .doctor-experience")
+
+# Only the parts of a page the selectors above read are parsed; navigation, footer and scripts are skipped
+_PROFILE_LINK_STRAINER = SoupStrainer("a", href=re.compile(r"/doctors/"))
+_PROFILE_CLASS_RE = re.compile(r"special|fee|city|area|hospital|address|rating|experience")
+
+
+class _ProfileFieldFilter(ElementFilter):
+    """Parse-time filter keeping the name heading and elements whose class a profile selector uses.
+
+    A callable passed to `SoupStrainer` only ever sees the tag name, so the
+    class check needs `allow_tag_creation`, which also gets the raw attributes.
+    """
+
+    def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Optional[dict]) -> bool:
+        if name == "h1":
+            return True
+        classes = (attrs or {}).get("class") or ""
+        if isinstance(classes, list):
+            classes = " ".join(classes)
+        return bool(_PROFILE_CLASS_RE.search(classes))
+
+    def allow_string_creation(self, string: str) -> bool:
+        # Text outside the kept elements is dropped, as a SoupStrainer would
+        return False
+
+
+_PROFILE_STRAINER = _ProfileFieldFilter()
+
 
 class OladocScraper(BaseScraper):
     """Scraper for Oladoc doctor profiles.
@@ -19,6 +62,14 @@ class OladocScraper(BaseScraper):
     """
 
     PLATFORM = "oladoc"
+    WRITE_BATCH_SIZE = 500  # doctor upserts sent per bulk_write
+    HTTP_MAX_MISSES = 5  # consecutive non-profile HTTP responses before the scraper sticks to the browser
+    HTTP_HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+        ),
+    }
 
     def __init__(
         self,
@@ -28,52 +79,68 @@ class OladocScraper(BaseScraper):
         timeout_ms: int = 15000,
         max_retries: int = 3,
         disable_js: bool = False,
+        http_fetch: bool = True,
     ) -> None:
+        """`http_fetch` fetches profiles over a keep-alive HTTP session, using the
+        browser only for profiles whose HTML is not a rendered profile (and for all of
+        them after `HTTP_MAX_MISSES` consecutive misses)."""
         super().__init__(headless=headless, timeout_ms=timeout_ms, max_retries=max_retries, disable_js=disable_js)
         self.mongo_client = mongo_client
         self.listing_url = listing_url
+        self.http_fetch = http_fetch
+        self._http: Optional[requests.Session] = None
+        self._http_misses = 0
+
+    def __enter__(self) -> "OladocScraper":
+        super().__enter__()
+        if self.http_fetch:
+            self._http = requests.Session()
+            self._http.headers.update(self.HTTP_HEADERS)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        super().__exit__(exc_type, exc_val, exc_tb)
 
     # ---------------------------------------------------------------------
 
     def _extract_profile_links(self, html: str) -> List[str]:
         """Extract profile URLs from listing page HTML."""
 
-        soup = BeautifulSoup(html, "html.parser")
-        links: List[str] = []
+        soup = make_soup(html, parse_only=_PROFILE_LINK_STRAINER)
+        links: Dict[str, None] = {}  # insertion-ordered set
 
         # Example selectors; may need updates over time
-        for card in soup.select("a[href*='/doctors/']"):
+        for card in _PROFILE_LINK_SEL.select(soup):
             href = card.get("href")
             if not href:
                 continue
             if href.startswith("/"):
                 href = "https://www.oladoc.com" + href
-            if href not in links:
-                links.append(href)
+            links[href] = None
 
         logger.info("Found {} Oladoc profile links on listing page", len(links))
-        return links
+        return list(links)
 
     def _parse_profile(self, html: str, profile_url: str) -> Optional[DoctorModel]:
         """Parse one doctor profile page into a DoctorModel instance."""
 
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html, parse_only=_PROFILE_STRAINER)
 
-        name = clean_text(self._first_text(soup.select_one("h1")))
-        specialties = [
-            clean_text(li.get_text())
-            for li in soup.select(".speciality, .specialties li, .doctor-specialities li")
-            if clean_text(li.get_text())
-        ]
+        name = clean_text(self._first_text(soup.find("h1")))
+        # Each item's text is cleaned once
+        specialties = [text for text in (clean_text(li.get_text()) for li in _SPECIALTY_SEL.select(soup)) if text]
 
-        fees_text = clean_text(self._first_text(soup.select_one(".fee, .doctor-fee, .consultation-fee")))
-        city = clean_text(self._first_text(soup.select_one(".city, .doctor-city"))) or ""
-        area = clean_text(self._first_text(soup.select_one(".area, .doctor-area")))
-        hospital = clean_text(self._first_text(soup.select_one(".hospital, .doctor-hospital")))
-        address = clean_text(self._first_text(soup.select_one(".address, .clinic-address")))
+        fees_text = clean_text(self._first_text(_FEE_SEL.select_one(soup)))
+        city = clean_text(self._first_text(_CITY_SEL.select_one(soup))) or ""
+        area = clean_text(self._first_text(_AREA_SEL.select_one(soup)))
+        hospital = clean_text(self._first_text(_HOSPITAL_SEL.select_one(soup)))
+        address = clean_text(self._first_text(_ADDRESS_SEL.select_one(soup)))
 
-        rating_text = clean_text(self._first_text(soup.select_one(".rating, .doctor-rating span")))
-        experience = clean_text(self._first_text(soup.select_one(".experience, .doctor-experience")))
+        rating_text = clean_text(self._first_text(_RATING_SEL.select_one(soup)))
+        experience = clean_text(self._first_text(_EXPERIENCE_SEL.select_one(soup)))
 
         if not name:
             logger.warning("Skipping Oladoc profile without name: {}", profile_url)
@@ -94,6 +161,47 @@ class OladocScraper(BaseScraper):
         )
         return model
 
+    @staticmethod
+    def _is_rendered_profile(html: str) -> bool:
+        """Return True if HTML is a rendered profile: a name heading plus a specialty or fee.
+
+        Error, challenge and interstitial pages usually have an `<h1>` too, so the
+        heading alone is not enough.
+        """
+        if "<h1" not in html:
+            return False
+        soup = make_soup(html, parse_only=_PROFILE_STRAINER)
+        return soup.find("h1") is not None and (
+            _SPECIALTY_SEL.select_one(soup) is not None or _FEE_SEL.select_one(soup) is not None
+        )
+
+    def _fetch_profile_html(self, url: str) -> str:
+        """Fetch a profile's HTML over HTTP if it is server-rendered, otherwise with the browser.
+
+        After HTTP_MAX_MISSES consecutive misses the HTTP session is closed and every
+        later profile is loaded with the browser.
+        """
+        if self._http is not None:
+            try:
+                response = self._http.get(url, timeout=self.timeout_ms / 1000)
+                response.raise_for_status()
+                if self._is_rendered_profile(response.text):
+                    self._http_misses = 0
+                    return response.text
+                self._http_misses += 1
+            except requests.RequestException as exc:
+                logger.debug("HTTP fetch failed for {}: {}", url, exc)
+                self._http_misses += 1
+
+            if self._http_misses >= self.HTTP_MAX_MISSES:
+                logger.info("Oladoc profiles need the browser; disabling HTTP fetching")
+                self._http.close()
+                self._http = None
+
+        self.load_page(url)
+        self.wait_for("body")
+        return self.get_html()
+
     @staticmethod
     def _first_text(element) -> Optional[str]:  # noqa: ANN001
         return element.get_text(strip=True) if element else None
@@ -118,18 +226,19 @@ class OladocScraper(BaseScraper):
         total = 0
         inserted = 0
         skipped = 0
+        # Known profiles, looked up for the whole listing in one query
+        existing_urls = self.mongo_client.existing_doctor_urls(profile_links)
+        doctor_ops: List[UpdateOne] = []
 
         for url in profile_links:
             total += 1
-            if self.mongo_client.doctor_exists(url):
+            if url in existing_urls:
                 logger.info("Duplicate doctor (already exists) skipped: {}", url)
                 skipped += 1
                 continue
 
             logger.info("Scraping Oladoc profile {} of {}: {}", total, len(profile_links), url)
-            self.load_page(url)
-            self.wait_for("body")
-            html = self.get_html()
+            html = self._fetch_profile_html(url)
 
             try:
                 model = self._parse_profile(html, url)
@@ -137,12 +246,18 @@ class OladocScraper(BaseScraper):
                     skipped += 1
                     continue
 
-                doc_dict = model.dict()
-                self.mongo_client.insert_doctor(doc_dict)
-                inserted += 1
+                doctor_ops.append(UpdateOne({"profile_url": url}, {"$set": model.model_dump()}, upsert=True))
+                existing_urls.add(url)
             except Exception as exc:  # noqa: BLE001
-                logger.exception("Error parsing/saving Oladoc profile {}: {}", url, exc)
+                logger.exception("Error parsing Oladoc profile {}: {}", url, exc)
                 skipped += 1
+                continue
+
+            if len(doctor_ops) >= self.WRITE_BATCH_SIZE:
+                inserted += self.mongo_client.bulk_update(self.mongo_client.doctors, doctor_ops)
+                doctor_ops = []
+
+        inserted += self.mongo_client.bulk_update(self.mongo_client.doctors, doctor_ops)
 
         logger.info(
             "Oladoc scraping finished. total={}, inserted={}, skipped={}",
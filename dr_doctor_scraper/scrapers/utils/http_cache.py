@@ -0,0 +1,96 @@
+"""On-disk cache for pages fetched over HTTP, revalidated with conditional GETs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from scrapers.logger import logger
+
+
+class HttpPageCache:
+    """Store page bodies with their `ETag` / `Last-Modified` validators, keyed by URL.
+
+    For cached URLs `fetch` sends `If-None-Match` / `If-Modified-Since`; on
+    `304 Not Modified` the stored body is returned instead of being downloaded
+    again. Only responses carrying a validator are stored. Files are replaced
+    atomically, so several threads (or runs) can share one directory.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory (created if missing; `~` is expanded)
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        """Return the (body, validators) file paths for a URL."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.html", self.directory / f"{key}.json"
+
+    def fetch(self, session: requests.Session, url: str, timeout: float) -> str:
+        """GET a page, revalidating the cached copy if there is one.
+
+        Args:
+            session: HTTP session used for the request
+            url: Page URL
+            timeout: Request timeout in seconds
+
+        Returns:
+            Page HTML (from the cache on 304, otherwise from the response)
+
+        Raises:
+            requests.RequestException: If the request fails or returns an error status
+        """
+        body_path, meta_path = self._paths(url)
+        headers: Dict[str, str] = {}
+        validators = self._read_validators(meta_path)
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = session.get(url, timeout=timeout, headers=headers)
+        if response.status_code == 304:
+            try:
+                return body_path.read_text(encoding="utf-8")
+            except OSError:
+                # Body went missing after the validators were read; download it again
+                response = session.get(url, timeout=timeout)
+
+        response.raise_for_status()
+        self._store(body_path, meta_path, response)
+        return response.text
+
+    @staticmethod
+    def _read_validators(meta_path: Path) -> Dict[str, str]:
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _store(body_path: Path, meta_path: Path, response: requests.Response) -> None:
+        """Save a response body and its validators (nothing to revalidate without them)."""
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        if not any(validators.values()):
+            return
+        try:
+            # Body first: validators are only ever written for a body that is already in place
+            for path, text in ((body_path, response.text), (meta_path, json.dumps(validators))):
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{id(response)}.tmp")
+                tmp_path.write_text(text, encoding="utf-8")
+                os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.debug("Failed to cache {}: {}", response.url, exc)
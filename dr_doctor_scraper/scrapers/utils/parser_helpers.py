@@ -1,8 +1,35 @@
 from __future__ import annotations
 
 import re
+from importlib.util import find_spec
 from typing import Any, Callable, Optional
 
+from bs4 import BeautifulSoup
+from bs4.filter import ElementFilter
+
+# lxml's C parser is several times faster than the pure-Python html.parser on large
+# profile/listing pages; fall back to the stdlib parser if it is not installed
+HTML_PARSER = "lxml" if find_spec("lxml") is not None else "html.parser"
+
+# Called for nearly every field of every card, so compile the patterns once
+_WHITESPACE_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"[0-9]+(?:\.[0-9]+)?")
+_INTEGER_RE = re.compile(r"[0-9]+")
+
+
+def make_soup(html: str, parse_only: Optional[ElementFilter] = None) -> BeautifulSoup:
+    """Parse HTML with the fastest available BeautifulSoup tree builder.
+    
+    Args:
+        html: HTML content to parse
+        parse_only: Only build the tree for matching elements (and their
+            descendants), e.g. a `SoupStrainer`; on large pages this skips most of the object tree
+        
+    Returns:
+        BeautifulSoup document
+    """
+    return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+
 
 def clean_text(text: Optional[str]) -> Optional[str]:
     """Clean and normalize text string by removing extra whitespace.
@@ -15,7 +42,7 @@ def clean_text(text: Optional[str]) -> Optional[str]:
     """
     if text is None:
         return None
-    cleaned = re.sub(r"\s+", " ", text).strip()
+    cleaned = _WHITESPACE_RE.sub(" ", text).strip()
     return cleaned or None
 
 
@@ -32,8 +59,8 @@ def extract_number(text: Optional[str]) -> Optional[float]:
     """
     if text is None:
         return None
-    numbers = re.findall(r"[0-9]+(?:\.[0-9]+)?", text.replace(",", ""))
-    return float(numbers[0]) if numbers else None
+    match = _NUMBER_RE.search(text.replace(",", ""))
+    return float(match.group()) if match else None
 
 
 def normalize_fee(text: Optional[str]) -> Optional[int]:
@@ -50,8 +77,8 @@ def normalize_fee(text: Optional[str]) -> Optional[int]:
     """
     if text is None:
         return None
-    numbers = re.findall(r"[0-9]+", text.replace(",", ""))
-    return int(numbers[0]) if numbers else None
+    match = _INTEGER_RE.search(text.replace(",", ""))
+    return int(match.group()) if match else None
 
 
 def safe_get(source: Any, getter: Callable[[Any], Any], default: Any = None) -> Any:
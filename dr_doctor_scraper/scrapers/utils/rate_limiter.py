@@ -0,0 +1,51 @@
+"""Token-bucket rate limiter used to pace requests to scraped sites."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token-bucket rate limiter.
+
+    Unlike a fixed `time.sleep()` after every request, time already spent on the
+    request itself counts towards the interval, so `acquire()` only sleeps for
+    whatever is left.
+
+    Usage:
+        limiter = RateLimiter(rate=2.0)  # at most ~2 requests per second
+        for url in urls:
+            limiter.acquire()
+            fetch(url)
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second (i.e. sustained requests per second)
+            capacity: Maximum burst size (1 = evenly spaced requests)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+
+            if self._tokens < 1.0:
+                wait = (1.0 - self._tokens) / self.rate
+                time.sleep(wait)
+                self._last_refill = time.monotonic()
+                self._tokens = 0.0
+            else:
+                self._tokens -= 1.0
@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 import re
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Optional, Dict, Tuple
 
 BASE_URL = "https://www.marham.pk"
 
+# Compiled once at import: these helpers run per practice and per doctor in hot loops
+_HOSPITAL_PATH_RE = re.compile(r"/hospitals/([^/]+)/([^/]+)(?:/([^/]+))?")
+_HOSPITAL_SEGMENT = "/hospitals/"
+
 
 def parse_hospital_url(url: str) -> Dict[str, Optional[str]]:
     """Parse hospital URL to extract city, name, and area.
@@ -20,31 +25,36 @@ def parse_hospital_url(url: str) -> Dict[str, Optional[str]]:
     Returns:
         Dictionary with keys: city, name, area (all optional)
     """
-    result = {"city": None, "name": None, "area": None}
-    
     if not url:
-        return result
+        return {"city": None, "name": None, "area": None}
     
+    # Fresh dict per call: callers may modify the result, the cached parse is a tuple
+    city, name, area = _parse_hospital_path(url)
+    return {"city": city, "name": name, "area": area}
+
+
+@lru_cache(maxsize=8192)
+def _parse_hospital_path(url: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Memoized (city, name, area) parse behind `parse_hospital_url`."""
     # Remove base URL and query parameters
-    url = url.replace(BASE_URL, "").replace("https://www.marham.pk", "").replace("http://www.marham.pk", "")
-    if "?" in url:
-        url = url.split("?")[0]
+    url = url.replace(BASE_URL, "").replace("http://www.marham.pk", "")
+    url = url.split("?", 1)[0]
     
     # Pattern: /hospitals/(city)/(name)/(area)
-    pattern = r"/hospitals/([^/]+)/([^/]+)(?:/([^/]+))?"
-    match = re.search(pattern, url)
-    
-    if match:
-        result["city"] = match.group(1).replace("-", " ").title() if match.group(1) else None
-        result["name"] = match.group(2).replace("-", " ").title() if match.group(2) else None
-        result["area"] = match.group(3).replace("-", " ").title() if match.group(3) else None
+    match = _HOSPITAL_PATH_RE.search(url)
+    if not match:
+        return None, None, None
     
-    return result
+    return tuple(part.replace("-", " ").title() if part else None for part in match.groups())
 
 
+@lru_cache(maxsize=8192)
 def is_hospital_url(url: str) -> bool:
     """Check if URL is a hospital URL.
     
+    Pure function of its argument, so results are memoized: the same hospital
+    URLs are checked once per doctor per practice within a run.
+    
     Args:
         url: URL string to check
         
@@ -53,7 +63,8 @@ def is_hospital_url(url: str) -> bool:
     """
     if not url:
         return False
-    return "/hospitals/" in url
+    # Plain substring check runs in C; no regex needed for this test
+    return _HOSPITAL_SEGMENT in url
 
 
 def is_doctor_url(url: str) -> bool:
@@ -83,5 +94,6 @@ def is_video_consultation_url(url: str) -> bool:
         return False
     # Video consultation URLs might have specific patterns
     # This needs to be updated based on actual URL patterns
-    return "video" in url.lower() or "consultation" in url.lower()
+    lowered = url.lower()
+    return "video" in lowered or "consultation" in lowered
 